@@ -1,19 +1,81 @@
 #!/usr/bin/env bash
+#
+# Copyright 2020 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Asks the worker for a connector that does not exist. Like GET /connectors, the request is handled by the herder,
+# so it only gets an answer (404) once the worker has joined the Connect group, but the response does not grow with
+# the number of connectors. The root resource would answer as soon as the REST server is up, even when the worker
+# can not reach Kafka.
+# The last result is kept in CONNECT_HEALTHCHECK_RESULT_FILE and reused for CONNECT_HEALTHCHECK_CACHE_SECONDS
+# (default 4, less than the 5 second HEALTHCHECK interval so every Docker check is fresh, while probes that arrive
+# together, such as the liveness and readiness probes of an orchestrator, share one request; 0 disables it).
+#
+# When CONNECT_HEALTHCHECK_STATUS_FILE is set, connector and task state counts are written to it as JSON,
+# at most every CONNECT_HEALTHCHECK_STATUS_INTERVAL seconds. The file is only ever replaced by a complete document.
+
+RESULT_FILE=${CONNECT_HEALTHCHECK_RESULT_FILE:-/tmp/kafka-connect-healthcheck}
+CACHE_SECONDS=${CONNECT_HEALTHCHECK_CACHE_SECONDS:-4}
+STATUS_INTERVAL=${CONNECT_HEALTHCHECK_STATUS_INTERVAL:-60}
+PROBE_CONNECTOR="__healthcheck_probe__"
 
 if [[ -z $CONNECT_SSL_ENDPOINT_IDENTIFICATION_ALGORITHM ]]; then
-  if [[ $(curl -s -o /dev/null -w %{http_code} http://$CONNECT_REST_ADVERTISED_HOST_NAME:$CONNECT_REST_PORT/connectors) = 200 ]]; then
-    echo "Woohoo! Kafka Connect is up!"
-    exit 0
-  else 
-    echo -e $(date) "\tKafka Connect HTTP state: " $(curl -s -o /dev/null -w %{http_code} $CONNECT_SSL_ENDPOINT_IDENTIFICATION_ALGORITHM://$CONNECT_REST_ADVERTISED_HOST_NAME:$CONNECT_REST_PORT/connectors) " (waiting for 200)"
-    exit 1
-  fi
+  URL="http://$CONNECT_REST_ADVERTISED_HOST_NAME:$CONNECT_REST_PORT"
+  CURL_OPTS=""
+  LISTENER=""
 else
-  if [[ $(curl -k -s -o /dev/null -w %{http_code} $CONNECT_SSL_ENDPOINT_IDENTIFICATION_ALGORITHM://$CONNECT_REST_ADVERTISED_HOST_NAME:$CONNECT_REST_PORT/connectors) = 200 ]]; then
-    echo "Woohoo! Kafka Connect with SSL listener is up!"
-    exit 0
-  else 
-    echo -e $(date) "\tKafka Connect with SSL listener HTTP state: " $(curl -k -s -o /dev/null -w %{http_code} http://$CONNECT_REST_ADVERTISED_HOST_NAME:$CONNECT_REST_PORT/connectors) " (waiting for 200)"
-    exit 1
+  URL="$CONNECT_SSL_ENDPOINT_IDENTIFICATION_ALGORITHM://$CONNECT_REST_ADVERTISED_HOST_NAME:$CONNECT_REST_PORT"
+  CURL_OPTS="-k"
+  LISTENER=" with SSL listener"
+fi
+
+now=$(date +%s)
+
+# Connector and task state counts, refreshed in the background so they never slow down the probe.
+if [[ -n $CONNECT_HEALTHCHECK_STATUS_FILE ]]; then
+  # The time of the last refresh is kept apart, the status file only changes once a refresh completes.
+  STATUS_STAMP_FILE="$CONNECT_HEALTHCHECK_STATUS_FILE.refreshed"
+  last_status=$(stat -c %Y "$STATUS_STAMP_FILE" 2>/dev/null || echo 0)
+  if (( now - last_status >= STATUS_INTERVAL )); then
+    touch "$STATUS_STAMP_FILE"
+    ( curl $CURL_OPTS -s --max-time 30 "$URL/connectors?expand=status" \
+        | python -c '
+import collections, json, sys, time
+connectors, tasks = collections.Counter(), collections.Counter()
+for status in json.load(sys.stdin).values():
+    connectors[status["status"]["connector"]["state"]] += 1
+    for task in status["status"]["tasks"]:
+        tasks[task["state"]] += 1
+print(json.dumps({"timestamp": int(time.time()), "connectors": connectors, "tasks": tasks}, sort_keys=True))
+' > "$CONNECT_HEALTHCHECK_STATUS_FILE.tmp" \
+      && mv "$CONNECT_HEALTHCHECK_STATUS_FILE.tmp" "$CONNECT_HEALTHCHECK_STATUS_FILE" ) > /dev/null 2>&1 &
   fi
 fi
+
+if (( CACHE_SECONDS > 0 )) && [[ -f $RESULT_FILE ]] && read -r checked_at http_code < "$RESULT_FILE" \
+    && (( now - checked_at < CACHE_SECONDS )); then
+  :
+else
+  http_code=$(curl $CURL_OPTS -s -o /dev/null --max-time 10 -w %{http_code} "$URL/connectors/$PROBE_CONNECTOR")
+  echo "$now $http_code" > "$RESULT_FILE.$$" && mv "$RESULT_FILE.$$" "$RESULT_FILE"
+fi
+
+# 404 is the answer of a worker that is up, 200 only if a connector has the probe name.
+if [[ $http_code = 404 || $http_code = 200 ]]; then
+  echo "Woohoo! Kafka Connect$LISTENER is up!"
+  exit 0
+else
+  echo -e $(date) "\tKafka Connect$LISTENER HTTP state: " $http_code " (waiting for 404)"
+  exit 1
+fi
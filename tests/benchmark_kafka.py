@@ -0,0 +1,276 @@
+"""
+Throughput and latency benchmarks for the broker images.
+
+Runs kafka-producer-perf-test and kafka-consumer-perf-test against the cluster fixtures of test_kafka.py (plain,
+SSL and SASL, bridged and host networking) and writes the results to a JSON file:
+
+    BENCHMARK_IMAGE=confluentinc/cp-server venv/bin/py.test tests/benchmark_kafka.py -v
+
+Settings (environment variables):
+
+    BENCHMARK_IMAGE        Broker and client image, defaults to confluentinc/cp-kafka.
+    BENCHMARK_RESULTS      Results file, defaults to benchmark-results.json. Scenarios run again replace their entry.
+    BENCHMARK_RECORDS      Records produced and consumed per scenario, defaults to 500000.
+    BENCHMARK_RECORD_SIZE  Record size in bytes, defaults to 100.
+
+Results of two builds can be compared with:
+
+    python tests/benchmark_kafka.py compare baseline.json benchmark-results.json
+"""
+
+import json
+import os
+import re
+import sys
+import time
+import unittest
+import utils
+import test_kafka
+
+BENCHMARK_IMAGE = os.environ.get("BENCHMARK_IMAGE", "confluentinc/cp-kafka")
+BENCHMARK_RESULTS = os.environ.get("BENCHMARK_RESULTS", "benchmark-results.json")
+BENCHMARK_RECORDS = int(os.environ.get("BENCHMARK_RECORDS", "500000"))
+BENCHMARK_RECORD_SIZE = int(os.environ.get("BENCHMARK_RECORD_SIZE", "100"))
+
+TOPIC_CREATE = "bash -c 'kafka-topics --create --topic {topic} --partitions {partitions} --replication-factor 3 --if-not-exists --zookeeper $KAFKA_ZOOKEEPER_CONNECT'"
+PRODUCER_PERF = "bash -c 'kafka-producer-perf-test --topic {topic} --num-records {records} --record-size {record_size} --throughput -1 --producer-props bootstrap.servers={brokers} acks=all --producer.config {config}'"
+CONSUMER_PERF = "bash -c 'kafka-consumer-perf-test --broker-list {brokers} --topic {topic} --messages {records} --consumer.config {config} --timeout 60000'"
+
+# 500000 records sent, 98231.8 records/sec (9.37 MB/sec), 1523.41 ms avg latency, 2153.00 ms max latency, 1572 ms 50th, 2013 ms 95th, 2102 ms 99th, 2149 ms 99.9th.
+PRODUCER_RESULT = re.compile(
+    r"(?P<records>\d+) records sent, (?P<records_per_sec>[\d.]+) records/sec \((?P<mb_per_sec>[\d.]+) MB/sec\), "
+    r"(?P<latency_avg_ms>[\d.]+) ms avg latency, (?P<latency_max_ms>[\d.]+) ms max latency, "
+    r"(?P<latency_p50_ms>\d+) ms 50th, (?P<latency_p95_ms>\d+) ms 95th, (?P<latency_p99_ms>\d+) ms 99th, "
+    r"(?P<latency_p999_ms>\d+) ms 99.9th")
+
+# Metrics compared by `compare`, and whether a higher value is better.
+METRICS = [
+    ("producer", "records_per_sec", True),
+    ("producer", "mb_per_sec", True),
+    ("producer", "latency_p50_ms", False),
+    ("producer", "latency_p99_ms", False),
+    ("producer", "latency_p999_ms", False),
+    ("consumer", "records_per_sec", True),
+    ("consumer", "mb_per_sec", True),
+]
+
+
+def parse_producer_perf(output):
+    """Parses the summary line of kafka-producer-perf-test, the last one matching the expected format."""
+    results = PRODUCER_RESULT.findall(output)
+    if not results:
+        return None
+    values = dict(zip(sorted(PRODUCER_RESULT.groupindex, key=PRODUCER_RESULT.groupindex.get), results[-1]))
+    return dict((key, int(value) if key == "records" else float(value)) for key, value in values.items())
+
+
+def parse_consumer_perf(output):
+    """Parses the CSV line following the header printed by kafka-consumer-perf-test."""
+    lines = [line.strip() for line in output.splitlines()]
+    for i, line in enumerate(lines):
+        if line.startswith("start.time") and i + 1 < len(lines):
+            values = dict(zip([h.strip() for h in line.split(",")], [v.strip() for v in lines[i + 1].split(",")]))
+            if "nMsg.sec" not in values:
+                return None
+            return {
+                "records": int(float(values["data.consumed.in.nMsg"])),
+                "records_per_sec": float(values["nMsg.sec"]),
+                "mb_per_sec": float(values["MB.sec"]),
+                "fetch_records_per_sec": float(values.get("fetch.nMsg.sec", 0)),
+                "fetch_mb_per_sec": float(values.get("fetch.MB.sec", 0)),
+            }
+    return None
+
+
+def image_id(image):
+    try:
+        return utils.get_docker_client().inspect_image(image)["Id"]
+    except Exception:
+        return None
+
+
+def save_result(scenario, result, path=BENCHMARK_RESULTS):
+    """Adds the result of a scenario to the results file, replacing an earlier result for the same scenario."""
+    data = {"image": BENCHMARK_IMAGE, "image_id": image_id(BENCHMARK_IMAGE), "results": {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = json.load(f)
+        if previous.get("image_id") == data["image_id"]:
+            data["results"] = previous.get("results", {})
+    data["timestamp"] = int(time.time())
+    data["records"] = BENCHMARK_RECORDS
+    data["record_size"] = BENCHMARK_RECORD_SIZE
+    data["results"][scenario] = result
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def compare(baseline_path, current_path):
+    """Prints the change of every metric between two results files."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    print "%s (%s) -> %s (%s)\n" % (baseline["image"], (baseline.get("image_id") or "")[:19],
+                                    current["image"], (current.get("image_id") or "")[:19])
+    for scenario in sorted(set(baseline["results"]) & set(current["results"])):
+        print scenario
+        for client, metric, higher_is_better in METRICS:
+            before = baseline["results"][scenario].get(client, {}).get(metric)
+            after = current["results"][scenario].get(client, {}).get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            worse = change < 0 if higher_is_better else change > 0
+            print "  %-8s %-16s %12.2f %12.2f %+7.1f%%%s" % (
+                client, metric, before, after, change, " (worse)" if worse and abs(change) >= 5 else "")
+
+
+class KafkaBenchmark(unittest.TestCase):
+    """
+    Reuses the cluster setup of a test_kafka.py class (`fixture`), with the brokers running BENCHMARK_IMAGE, then
+    produces and consumes BENCHMARK_RECORDS records from a separate client container. The image overrides are part of
+    the cluster pool key, so a cluster started by test_kafka.py with other images is never reused here.
+    """
+
+    scenario = None
+    fixture = None
+    network = None
+    brokers = None
+    zookeeper_connect = None
+    producer_config = "/dev/null"
+    consumer_config = "/dev/null"
+    producer_opts = None
+    consumer_opts = None
+    secrets_dir = None
+
+    @classmethod
+    def setUpClass(cls):
+        if cls.fixture is None:
+            raise unittest.SkipTest("Base class")
+        utils.IMAGE_OVERRIDES["confluentinc/cp-kafka"] = BENCHMARK_IMAGE
+        try:
+            cls.fixture.setUpClass.__func__(cls)
+        finally:
+            utils.IMAGE_OVERRIDES.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.fixture is not None:
+            cls.fixture.tearDownClass.__func__(cls)
+
+    def run_client(self, name, command, opts=None, until=None):
+        host_config = {"NetworkMode": self.network}
+        if self.secrets_dir:
+            host_config["Binds"] = ["%s:/etc/kafka/secrets" % self.secrets_dir]
+        environment = {"KAFKA_ZOOKEEPER_CONNECT": self.zookeeper_connect}
+        if opts:
+            environment["KAFKA_OPTS"] = opts
+        return utils.run_docker_command(
+            900,
+            image=BENCHMARK_IMAGE,
+            name=name,
+            environment=environment,
+            command=command,
+            host_config=host_config,
+            until=until)
+
+    def test_throughput_and_latency(self):
+        topic = "benchmark-%s" % self.scenario
+        self.run_client("%s-producer" % self.scenario, TOPIC_CREATE.format(topic=topic, partitions=3), self.producer_opts)
+
+        producer_logs = self.run_client(
+            "%s-producer" % self.scenario,
+            PRODUCER_PERF.format(topic=topic, records=BENCHMARK_RECORDS, record_size=BENCHMARK_RECORD_SIZE,
+                                 brokers=self.brokers, config=self.producer_config),
+            self.producer_opts, until=PRODUCER_RESULT)
+        producer = parse_producer_perf(producer_logs)
+        self.assertTrue(producer is not None, "No producer results in: %s" % producer_logs)
+        self.assertEquals(BENCHMARK_RECORDS, producer["records"])
+
+        consumer_logs = self.run_client(
+            "%s-consumer" % self.scenario,
+            CONSUMER_PERF.format(topic=topic, records=BENCHMARK_RECORDS, brokers=self.brokers,
+                                 config=self.consumer_config),
+            self.consumer_opts)
+        consumer = parse_consumer_perf(consumer_logs)
+        self.assertTrue(consumer is not None, "No consumer results in: %s" % consumer_logs)
+
+        save_result(self.scenario, {"producer": producer, "consumer": consumer})
+
+
+BRIDGED_ZK = "zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"
+HOST_ZK = "localhost:22181,localhost:32181,localhost:42181"
+SASL_HOST_ZK = "sasl.kafka.com:22181,sasl.kafka.com:32181,sasl.kafka.com:42181"
+KRB_OPTS = "-Djava.security.auth.login.config=/etc/kafka/secrets/{jaas} -Djava.security.krb5.conf=/etc/kafka/secrets/{krb} -Dsun.net.spi.nameservice.provider.1=sun"
+
+
+class PlainBridgedBenchmark(KafkaBenchmark):
+    scenario = "plain-bridged"
+    fixture = test_kafka.ClusterBridgedNetworkTest
+    network = "cluster-test_zk"
+    brokers = "kafka-1:9092"
+    zookeeper_connect = BRIDGED_ZK
+
+
+class PlainHostBenchmark(KafkaBenchmark):
+    scenario = "plain-host"
+    fixture = test_kafka.ClusterHostNetworkTest
+    network = "host"
+    brokers = "localhost:19092"
+    zookeeper_connect = HOST_ZK
+
+
+class SSLBridgedBenchmark(KafkaBenchmark):
+    scenario = "ssl-bridged"
+    fixture = test_kafka.ClusterSSLBridgedNetworkTest
+    network = "cluster-test_zk"
+    brokers = "kafka-ssl-1:9093"
+    zookeeper_connect = BRIDGED_ZK + "/ssl"
+    producer_config = "/etc/kafka/secrets/bridged.producer.ssl.config"
+    consumer_config = "/etc/kafka/secrets/bridged.consumer.ssl.config"
+    secrets_dir = "/tmp/kafka-cluster-bridge-test/secrets"
+
+
+class SSLHostBenchmark(KafkaBenchmark):
+    scenario = "ssl-host"
+    fixture = test_kafka.ClusterSSLHostNetworkTest
+    network = "host"
+    brokers = "localhost:29093"
+    zookeeper_connect = HOST_ZK + "/ssl"
+    producer_config = "/etc/kafka/secrets/host.producer.ssl.config"
+    consumer_config = "/etc/kafka/secrets/host.consumer.ssl.config"
+    secrets_dir = "/tmp/kafka-cluster-host-test/secrets"
+
+
+class SASLBridgedBenchmark(KafkaBenchmark):
+    scenario = "sasl-bridged"
+    fixture = test_kafka.ClusterSASLBridgedNetworkTest
+    network = "cluster-test_zk"
+    brokers = "kafka-sasl-ssl-1:9094"
+    zookeeper_connect = BRIDGED_ZK + "/saslssl"
+    producer_config = "/etc/kafka/secrets/bridged.producer.ssl.sasl.config"
+    consumer_config = "/etc/kafka/secrets/bridged.consumer.ssl.sasl.config"
+    producer_opts = KRB_OPTS.format(jaas="bridged_producer_jaas.conf", krb="bridged_krb.conf")
+    consumer_opts = KRB_OPTS.format(jaas="bridged_consumer_jaas.conf", krb="bridged_krb.conf")
+    secrets_dir = "/tmp/kafka-cluster-bridge-test/secrets"
+
+
+class SASLHostBenchmark(KafkaBenchmark):
+    scenario = "sasl-host"
+    fixture = test_kafka.ClusterSASLHostNetworkTest
+    network = "host"
+    brokers = "sasl.kafka.com:29094"
+    zookeeper_connect = SASL_HOST_ZK + "/saslssl"
+    producer_config = "/etc/kafka/secrets/host.producer.ssl.sasl.config"
+    consumer_config = "/etc/kafka/secrets/host.consumer.ssl.sasl.config"
+    producer_opts = KRB_OPTS.format(jaas="host_producer_jaas.conf", krb="host_krb.conf")
+    consumer_opts = KRB_OPTS.format(jaas="host_consumer_jaas.conf", krb="host_krb.conf")
+    secrets_dir = "/tmp/kafka-cluster-host-test/secrets"
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["compare"] or len(sys.argv) != 4:
+        print "Usage: %s compare BASELINE_RESULTS CURRENT_RESULTS" % sys.argv[0]
+        sys.exit(2)
+    compare(sys.argv[2], sys.argv[3])
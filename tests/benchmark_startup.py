@@ -0,0 +1,244 @@
+"""
+Startup latency benchmarks for the component images.
+
+Starts the dependencies of a component from its fixture once, then cold starts the component's container
+STARTUP_BENCHMARK_RUNS times (create, start, wait until ready, remove) and reports the distribution of:
+
+    pull_ms      Pulling the image, when it is not present (first run only).
+    create_ms    Creating the container.
+    start_ms     The docker start call.
+    <phase>_ms   The entrypoint phases reported by STARTUP_TIMING (env_override, configure, ensure, dub and cub
+                 calls, and launch, the time from the start of `run` until it execs the service).
+    service_ms   From the exec of the service until it is ready.
+    ready_ms     From the docker start call until the service is ready.
+
+    venv/bin/py.test tests/benchmark_startup.py -v
+
+Settings (environment variables):
+
+    STARTUP_BENCHMARK_RUNS     Cold starts per component, defaults to 5.
+    STARTUP_BENCHMARK_TIMEOUT  Seconds to wait for a component to be ready, defaults to 180.
+    STARTUP_BENCHMARK_RESULTS  Results file, defaults to startup-benchmark.json.
+"""
+
+import json
+import os
+import re
+import time
+import unittest
+import utils
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(CURRENT_DIR, "fixtures", "debian")
+
+STARTUP_BENCHMARK_RUNS = int(os.environ.get("STARTUP_BENCHMARK_RUNS", "5"))
+STARTUP_BENCHMARK_TIMEOUT = int(os.environ.get("STARTUP_BENCHMARK_TIMEOUT", "180"))
+STARTUP_BENCHMARK_RESULTS = os.environ.get("STARTUP_BENCHMARK_RESULTS", "startup-benchmark.json")
+
+REST_SERVER_STARTED = "Server started, listening for requests|Started NetworkTrafficServerConnector"
+PORT_OPEN = "bash -c '(exec 3<>/dev/tcp/localhost/{port}) 2>/dev/null && echo PASS || echo FAIL'"
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def summarize(runs):
+    """Returns {metric: {min, p50, p90, max, mean}} over the metrics present in the runs."""
+    metrics = sorted(set(metric for run in runs for metric in run))
+    summary = {}
+    for metric in metrics:
+        values = [run[metric] for run in runs if metric in run]
+        summary[metric] = {
+            "min": min(values),
+            "p50": utils.percentile(values, 50),
+            "p90": utils.percentile(values, 90),
+            "max": max(values),
+            "mean": sum(values) / float(len(values)),
+            "count": len(values),
+        }
+    return summary
+
+
+def parse_timing_records(logs):
+    """Returns the STARTUP_TIMING records in the container output."""
+    records = []
+    for line in logs.splitlines():
+        line = line.strip()
+        if line.startswith("{") and '"phase"' in line:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass
+    return records
+
+
+def phase_metrics(records):
+    """Sums the duration of the records of every phase, as <phase>_ms."""
+    metrics = {}
+    for record in records:
+        name = "%s_ms" % record["phase"].replace(" ", "_").replace("-", "_")
+        metrics[name] = metrics.get(name, 0) + record["duration_ms"]
+    return metrics
+
+
+def save_results(component, runs, path=STARTUP_BENCHMARK_RESULTS):
+    data = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+    data[component] = {"timestamp": int(time.time()), "runs": runs, "summary": summarize(runs)}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def report(component, runs):
+    print "\n%s, %d cold start(s)" % (component, len(runs))
+    print "  %-28s %8s %8s %8s %8s" % ("metric (ms)", "min", "p50", "p90", "max")
+    for metric, stats in sorted(summarize(runs).items()):
+        print "  %-28s %8d %8d %8d %8d" % (metric[:-3], stats["min"], stats["p50"], stats["p90"], stats["max"])
+
+
+class StartupBenchmark(unittest.TestCase):
+    """
+    `service` in the `fixture` file of `fixture_dir` is the measured container, `dependencies` are started once
+    for all runs. The service is ready when a log line matches `ready_log`, or when `ready_port` accepts
+    connections.
+    """
+
+    component = None
+    fixture_dir = None
+    fixture = "standalone-config.yml"
+    service = "default-config"
+    dependencies = []
+    ready_log = None
+    ready_port = None
+
+    @classmethod
+    def setUpClass(cls):
+        if cls.component is None:
+            raise unittest.SkipTest("Base class")
+        cls.cluster = utils.TestCluster("startup-benchmark", os.path.join(FIXTURES_DIR, cls.fixture_dir), cls.fixture)
+        for service in cls.cluster.cd.services:
+            if service["name"] == cls.service:
+                service.setdefault("environment", {})["STARTUP_TIMING"] = "true"
+        if cls.dependencies:
+            cls.cluster.get_project().up(service_names=cls.dependencies)
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.component is not None:
+            cls.cluster.shutdown()
+
+    def wait_ready(self, container, start):
+        """Returns the time at which the service was ready, in ms, or None after the timeout."""
+        deadline = start / 1000.0 + STARTUP_BENCHMARK_TIMEOUT
+        if self.ready_log:
+            waiter = utils.EventWaiter(self.cluster.get_project().client)
+            try:
+                condition = waiter.log_matches(container, re.compile(self.ready_log))
+                if waiter.wait([condition], max(1, deadline - time.time())):
+                    return now_ms()
+                return None
+            finally:
+                waiter.close()
+        while time.time() < deadline:
+            if "PASS" in container.start_exec(container.create_exec(PORT_OPEN.format(port=self.ready_port))):
+                return now_ms()
+            time.sleep(0.1)
+        return None
+
+    def cold_start(self, first):
+        service = self.cluster.get_project().get_service(self.service)
+        run = {}
+        if first and not utils.image_exists(service.image_name):
+            t = now_ms()
+            utils.pull_image(service.image_name)
+            run["pull_ms"] = now_ms() - t
+
+        t = now_ms()
+        container = service.create_container()
+        run["create_ms"] = now_ms() - t
+        try:
+            start = now_ms()
+            container.start()
+            run["start_ms"] = now_ms() - start
+
+            ready = self.wait_ready(container, start)
+            self.assertTrue(ready is not None, "%s not ready after %ss:\n%s" % (
+                self.component, STARTUP_BENCHMARK_TIMEOUT, container.logs()))
+            run["ready_ms"] = ready - start
+
+            records = parse_timing_records(container.logs())
+            run.update(phase_metrics(records))
+            launch = [r for r in records if r["phase"] == "launch"]
+            if launch:
+                run["service_ms"] = ready - (launch[-1]["start_ms"] + launch[-1]["duration_ms"])
+        finally:
+            container.stop(timeout=10)
+            container.remove()
+        return run
+
+    def test_startup_latency(self):
+        runs = [self.cold_start(i == 0) for i in range(STARTUP_BENCHMARK_RUNS)]
+        report(self.component, runs)
+        save_results(self.component, runs)
+
+
+class ZookeeperStartupBenchmark(StartupBenchmark):
+    component = "zookeeper"
+    fixture_dir = "zookeeper"
+    ready_log = "binding to port"
+
+
+class KafkaStartupBenchmark(StartupBenchmark):
+    component = "kafka"
+    fixture_dir = "kafka"
+    dependencies = ["zookeeper"]
+    ready_log = r"started \(kafka.server.KafkaServer\)"
+
+
+class SchemaRegistryStartupBenchmark(StartupBenchmark):
+    component = "schema-registry"
+    fixture_dir = "schema-registry"
+    dependencies = ["zookeeper", "kafka"]
+    ready_log = REST_SERVER_STARTED
+
+
+class KafkaRestStartupBenchmark(StartupBenchmark):
+    component = "kafka-rest"
+    fixture_dir = "kafka-rest"
+    dependencies = ["zookeeper", "kafka"]
+    ready_log = REST_SERVER_STARTED
+
+
+class KafkaConnectStartupBenchmark(StartupBenchmark):
+    component = "kafka-connect"
+    fixture_dir = "kafka-connect"
+    fixture = "distributed-single-node.yml"
+    service = "connect-host-json"
+    dependencies = ["zookeeper-host", "kafka-host"]
+    ready_log = "Kafka Connect started"
+
+
+class ControlCenterStartupBenchmark(StartupBenchmark):
+    component = "control-center"
+    fixture_dir = "control-center"
+    dependencies = ["zookeeper", "kafka"]
+    ready_log = REST_SERVER_STARTED
+
+
+class ReplicatorStartupBenchmark(StartupBenchmark):
+    component = "enterprise-replicator"
+    fixture_dir = "enterprise-replicator"
+    fixture = "cluster-host-plain.yml"
+    service = "connect-host-1"
+    dependencies = ["zookeeper-dest", "kafka-1-dest", "kafka-2-dest"]
+    ready_log = "Kafka Connect started"
+
+
+class KafkaMQTTStartupBenchmark(StartupBenchmark):
+    component = "kafka-mqtt"
+    fixture_dir = "kafka-mqtt"
+    dependencies = ["zookeeper", "kafka"]
+    ready_port = 1883
@@ -29,6 +29,10 @@ class BaseImageTest(unittest.TestCase):
         self.assertTrue(utils.path_exists_in_image(self.image, "/usr/local/bin/dub"))
         self.assertTrue(utils.path_exists_in_image(self.image, "/usr/local/bin/cub"))
 
+    def test_entrypoint_utils_exist(self):
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/dub-batch"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/ready"))
+
 
 class ZookeeperImageTest(unittest.TestCase):
 
@@ -137,14 +137,13 @@ class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-bridge", ZK_READY.format(servers="localhost:2181"))
         assert "PASS" in cls.cluster.run_command_on_service("kafka-bridge", KAFKA_READY.format(brokers=1))
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_c3_healthy_for_service(cls, service, network):
@@ -128,8 +128,8 @@ class ClusterHostNetworkTest(unittest.TestCase):
         src_b_replicator = create_connector("cluster-b", src_b_replicator_cmd, "localhost", "28082")
         self.assertEquals(src_b_replicator, "RUNNING")
 
-        foo_consumer_logs = self.cluster.run_command_on_service("kafka-1-src-a", CONSUME_DATA.format(messages=1000, brokers="localhost:9072", topic="foo.replica"))
+        foo_consumer_logs = self.cluster.run_command_on_service("kafka-1-src-a", CONSUME_DATA.format(messages=1000, brokers="localhost:9072", topic="foo.replica"), until="Processed a total of")
         self.assertTrue("Processed a total of 1000 messages" in foo_consumer_logs)
 
-        bar_consumer_logs = self.cluster.run_command_on_service("kafka-1-src-b", CONSUME_DATA.format(messages=1000, brokers="localhost:9072", topic="bar.replica"))
+        bar_consumer_logs = self.cluster.run_command_on_service("kafka-1-src-b", CONSUME_DATA.format(messages=1000, brokers="localhost:9072", topic="bar.replica"), until="Processed a total of")
         self.assertTrue("Processed a total of 1000 messages" in bar_consumer_logs)
@@ -1,3 +1,5 @@
+import atexit
+import functools
 import os
 import unittest
 import utils
@@ -73,6 +75,10 @@ JMX_CHECK = """bash -c "\
         java -jar jmxterm-1.0-alpha-4-uber.jar -l {jmx_hostname}:{jmx_port} -n -v silent "
 """
 
+METRICS_CHECK = """bash -c "\
+    for i in $(seq 60); do curl -sf http://localhost:{port}/metrics && exit 0; sleep 1; done; exit 1"
+"""
+
 
 class ConfigTest(unittest.TestCase):
 
@@ -110,6 +116,12 @@ class ConfigTest(unittest.TestCase):
         assert "PASS" in output
 
     def test_required_config_failure(self):
+        self.assertTrue(self.cluster.wait_for_exit([
+            "failing-config-zk-connect", "failing-config-adv-listeners", "failing-config-adv-hostname",
+            "failing-config-adv-port", "failing-config-port", "failing-config-host", "failing-config-ssl-keystore",
+            "failing-config-ssl-keystore-password", "failing-config-ssl-key-password", "failing-config-ssl-truststore",
+            "failing-config-ssl-truststore-password", "failing-config-sasl-jaas", "failing-config-sasl-missing-prop",
+            "failing-config-perf-profile"], 60))
         self.assertTrue("KAFKA_ZOOKEEPER_CONNECT is required." in self.cluster.service_logs("failing-config-zk-connect", stopped=True))
         self.assertTrue("KAFKA_ADVERTISED_LISTENERS is required." in self.cluster.service_logs("failing-config-adv-listeners", stopped=True))
         # Deprecated props.
@@ -126,6 +138,7 @@ class ConfigTest(unittest.TestCase):
 
         self.assertTrue("KAFKA_OPTS is required." in self.cluster.service_logs("failing-config-sasl-jaas", stopped=True))
         self.assertTrue("KAFKA_OPTS should contain 'java.security.auth.login.config' property." in self.cluster.service_logs("failing-config-sasl-missing-prop", stopped=True))
+        self.assertTrue("CONFLUENT_PERF_PROFILE must be one of: throughput low-latency small-footprint (was 'fastest')." in self.cluster.service_logs("failing-config-perf-profile", stopped=True))
 
     def test_default_config(self):
         self.is_kafka_healthy_for_service("default-config", 9092, 1)
@@ -244,6 +257,48 @@ class ConfigTest(unittest.TestCase):
                 """
         self.assertEquals(zk_props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
 
+    def test_perf_profile_config(self):
+        self.is_kafka_healthy_for_service("perf-profile", 9092, 1)
+        props = self.cluster.run_command_on_service("perf-profile", "bash -c 'cat /etc/kafka/kafka.properties | sort'")
+        # KAFKA_NUM_IO_THREADS is set in the environment and wins over the profile.
+        expected = """
+                advertised.listeners=PLAINTEXT://perf-profile:9092
+                broker.id=1
+                listeners=PLAINTEXT://0.0.0.0:9092
+                log.dirs=/var/lib/kafka/data
+                log.flush.interval.messages=9223372036854775807
+                log.flush.scheduler.interval.ms=9223372036854775807
+                num.io.threads=4
+                num.network.threads=8
+                num.replica.fetchers=4
+                queued.max.requests=1000
+                replica.fetch.max.bytes=4194304
+                replica.socket.receive.buffer.bytes=1048576
+                socket.receive.buffer.bytes=1048576
+                socket.send.buffer.bytes=1048576
+                zookeeper.connect=zookeeper:2181/perfprofile
+                """
+        self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
+
+    def test_jvm_sizing(self):
+        self.is_kafka_healthy_for_service("jvm-sizing", 9092, 1)
+        args = self.cluster.run_command_on_service("jvm-sizing", "cat /proc/1/cmdline").split("\0")
+        # The broker profile sizes the heap to 25% of the 2g memory limit, the CPU quota is 2 CPUs.
+        self.assertTrue("-Xmx512M" in args)
+        self.assertTrue("-Xms512M" in args)
+        self.assertTrue("-XX:MaxDirectMemorySize=307M" in args)
+        self.assertTrue("-XX:ParallelGCThreads=2" in args)
+        self.assertTrue("-XX:ActiveProcessorCount=2" in args)
+
+    def test_jvm_sizing_heap_opts(self):
+        self.is_kafka_healthy_for_service("jvm-sizing-heap-opts", 9092, 1)
+        args = self.cluster.run_command_on_service("jvm-sizing-heap-opts", "cat /proc/1/cmdline").split("\0")
+        # An explicit KAFKA_HEAP_OPTS is left untouched, the GC threads are still sized.
+        self.assertTrue("-Xmx384M" in args)
+        self.assertTrue("-Xms384M" in args)
+        self.assertFalse("-Xmx512M" in args)
+        self.assertTrue("-XX:ParallelGCThreads=2" in args)
+
     def test_ssl_config(self):
         self.is_kafka_healthy_for_service("ssl-config", 9092, 1, "ssl-config", "SSL")
         zk_props = self.cluster.run_command_on_service("ssl-config", "bash -c 'cat /etc/kafka/kafka.properties | sort'")
@@ -294,18 +349,57 @@ class ConfigTest(unittest.TestCase):
         self.assertEquals(zk_props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
 
 
+BRIDGED_ZK = "zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"
+HOST_ZK = "localhost:22181,localhost:32181,localhost:42181"
+SASL_HOST_ZK = "sasl.kafka.com:22181,sasl.kafka.com:32181,sasl.kafka.com:42181"
+
+
+def reset_topics(service, zookeeper_connect):
+    """Reset hook for utils.acquire_cluster, deletes the topics left by the class that used the cluster before."""
+    return functools.partial(utils.delete_topics, service=service, zookeeper_connect=zookeeper_connect)
+
+
+def copy_secrets(machine, machine_dir):
+    # A pooled cluster outlives the test class and its containers mount the secrets, remove them at exit.
+    machine.ssh("mkdir -p %s/secrets" % machine_dir)
+    machine.scp_to_machine(os.path.join(FIXTURES_DIR, "secrets"), machine_dir)
+    atexit.register(machine.ssh, "sudo rm -rf %s/secrets" % machine_dir)
+
+
+def create_bridged_keytabs(cluster):
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_broker1", principal="kafka", hostname="kafka-sasl-ssl-1"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_broker2", principal="kafka", hostname="kafka-sasl-ssl-2"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_broker3", principal="kafka", hostname="kafka-sasl-ssl-3"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_kafkacat", principal="bridged_kafkacat", hostname="bridged-kafkacat"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_producer", principal="bridged_producer", hostname="kafka-sasl-ssl-producer"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_consumer", principal="bridged_consumer", hostname="kafka-sasl-ssl-consumer"))
+
+
+def create_host_keytabs(cluster):
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_broker1", principal="kafka", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_broker2", principal="kafka", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_broker3", principal="kafka", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_producer", principal="host_producer", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_consumer", principal="host_consumer", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zookeeper-host-1", principal="zookeeper", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zookeeper-host-2", principal="zookeeper", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zookeeper-host-3", principal="zookeeper", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zkclient-host-1", principal="zkclient", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zkclient-host-2", principal="zkclient", hostname="sasl.kafka.com"))
+    cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zkclient-host-3", principal="zkclient", hostname="sasl.kafka.com"))
+
+
 class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-bridge", ZK_READY.format(servers="localhost:2181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-host", ZK_READY.format(servers="localhost:32181"))
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_kafka_healthy_for_service(cls, service, port, num_brokers, host="localhost", security_protocol="PLAINTEXT"):
@@ -358,17 +452,43 @@ class StandaloneNetworkingTest(unittest.TestCase):
             host_config={'NetworkMode': 'standalone-network-test_zk'})
         self.assertTrue("Version = 0.11.0.0-cp1;" in logs)
 
+    def test_metrics_bridged_network(self):
+        metrics = self.cluster.run_command_on_service("kafka-bridged-jmx", METRICS_CHECK.format(port=7071))
+        self.assertTrue("kafka_server_replicamanager_partitioncount" in metrics)
+        self.assertTrue("jvm_memory_bytes_used" in metrics)
+        # Per topic MBeans are not exported.
+        self.assertFalse('topic="' in metrics)
+
+
+class ClusterPoolTest(unittest.TestCase):
+
+    def test_second_class_reuses_cluster(self):
+        if not utils.CLUSTER_POOL.enabled:
+            raise unittest.SkipTest("CLUSTER_POOL=false")
+        # What the setUpClass and tearDownClass of StandaloneNetworkingTest do, then of a second class using the same fixture.
+        first = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
+        container_ids = sorted(container.id for container in first.get_project().containers())
+        utils.release_cluster(first)
+
+        resets = []
+        second = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml", reset=resets.append)
+        try:
+            self.assertIs(first, second)
+            self.assertEquals([second], resets)
+            self.assertEquals(container_ids, sorted(container.id for container in second.get_project().containers()))
+        finally:
+            utils.release_cluster(second)
+
 
 class ClusterBridgedNetworkTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-bridged-plain.yml")
-        cls.cluster.start()
-        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"))
+        cls.cluster = utils.acquire_cluster("cluster-test", FIXTURES_DIR, "cluster-bridged-plain.yml", reset=reset_topics("kafka-1", BRIDGED_ZK))
+        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers=BRIDGED_ZK))
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     def test_cluster_running(self):
         self.assertTrue(self.cluster.is_running())
@@ -398,7 +518,8 @@ class ClusterBridgedNetworkTest(unittest.TestCase):
             name="kafka-producer",
             environment={'KAFKA_ZOOKEEPER_CONNECT': "zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"},
             command=PLAIN_CLIENTS.format(brokers="kafka-1:9092", topic="foo", messages=100),
-            host_config={'NetworkMode': 'cluster-test_zk'})
+            host_config={'NetworkMode': 'cluster-test_zk'},
+            until="Processed a total of")
 
         self.assertTrue("Processed a total of 100 messages" in client_logs)
 
@@ -410,18 +531,10 @@ class ClusterSSLBridgedNetworkTest(ClusterBridgedNetworkTest):
         cls.machine = utils.TestMachine(machine_name)
 
         # Copy SSL files.
-        print cls.machine.ssh("mkdir -p /tmp/kafka-cluster-bridge-test/secrets")
-        local_secrets_dir = os.path.join(FIXTURES_DIR, "secrets")
-        cls.machine.scp_to_machine(local_secrets_dir, "/tmp/kafka-cluster-bridge-test")
+        copy_secrets(cls.machine, "/tmp/kafka-cluster-bridge-test")
 
-        cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-bridged-ssl.yml")
-        cls.cluster.start()
-        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"))
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.cluster.shutdown()
-        cls.machine.ssh("sudo rm -rf /tmp/kafka-cluster-bridge-test/secrets")
+        cls.cluster = utils.acquire_cluster("cluster-test", FIXTURES_DIR, "cluster-bridged-ssl.yml", reset=reset_topics("kafka-ssl-1", BRIDGED_ZK + "/ssl"))
+        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers=BRIDGED_ZK))
 
     def test_bridge_network(self):
         # Test from within the container
@@ -464,27 +577,13 @@ class ClusterSASLBridgedNetworkTest(ClusterBridgedNetworkTest):
         cls.machine = utils.TestMachine(machine_name)
 
         # Copy SSL files.
-        print cls.machine.ssh("mkdir -p /tmp/kafka-cluster-bridge-test/secrets")
-        local_secrets_dir = os.path.join(FIXTURES_DIR, "secrets")
-        cls.machine.scp_to_machine(local_secrets_dir, "/tmp/kafka-cluster-bridge-test")
+        copy_secrets(cls.machine, "/tmp/kafka-cluster-bridge-test")
 
-        cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-bridged-sasl.yml")
-        cls.cluster.start()
+        # The keytabs are created once, when the cluster starts.
+        cls.cluster = utils.acquire_cluster("cluster-test", FIXTURES_DIR, "cluster-bridged-sasl.yml",
+                                            reset=reset_topics("kafka-sasl-ssl-1", BRIDGED_ZK + "/saslssl"), setup=create_bridged_keytabs)
 
-        # Create keytabs
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_broker1", principal="kafka", hostname="kafka-sasl-ssl-1"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_broker2", principal="kafka", hostname="kafka-sasl-ssl-2"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_broker3", principal="kafka", hostname="kafka-sasl-ssl-3"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_kafkacat", principal="bridged_kafkacat", hostname="bridged-kafkacat"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_producer", principal="bridged_producer", hostname="kafka-sasl-ssl-producer"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="bridged_consumer", principal="bridged_consumer", hostname="kafka-sasl-ssl-consumer"))
-
-        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"))
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.cluster.shutdown()
-        cls.machine.ssh("sudo rm -rf /tmp/kafka-cluster-bridge-test/secrets")
+        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers=BRIDGED_ZK))
 
     def test_bridge_network(self):
         # Test from within the container
@@ -532,13 +631,12 @@ class ClusterSASLBridgedNetworkTest(ClusterBridgedNetworkTest):
 class ClusterHostNetworkTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-host-plain.yml")
-        cls.cluster.start()
-        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="localhost:22181,localhost:32181,localhost:42181"))
+        cls.cluster = utils.acquire_cluster("cluster-test", FIXTURES_DIR, "cluster-host-plain.yml", reset=reset_topics("kafka-1", HOST_ZK))
+        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers=HOST_ZK))
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     def test_cluster_running(self):
         self.assertTrue(self.cluster.is_running())
@@ -568,7 +666,8 @@ class ClusterHostNetworkTest(unittest.TestCase):
             name="kafka-producer",
             environment={'KAFKA_ZOOKEEPER_CONNECT': "localhost:22181,localhost:32181,localhost:42181"},
             command=PLAIN_CLIENTS.format(brokers="localhost:19092", topic="foo", messages=100),
-            host_config={'NetworkMode': 'host'})
+            host_config={'NetworkMode': 'host'},
+            until="Processed a total of")
 
         self.assertTrue("Processed a total of 100 messages" in client_logs)
 
@@ -580,19 +679,11 @@ class ClusterSSLHostNetworkTest(ClusterHostNetworkTest):
         cls.machine = utils.TestMachine(machine_name)
 
         # Copy SSL files.
-        print cls.machine.ssh("mkdir -p /tmp/kafka-cluster-host-test/secrets")
-        local_secrets_dir = os.path.join(FIXTURES_DIR, "secrets")
-        cls.machine.scp_to_machine(local_secrets_dir, "/tmp/kafka-cluster-host-test")
-
-        cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-host-ssl.yml")
-        cls.cluster.start()
+        copy_secrets(cls.machine, "/tmp/kafka-cluster-host-test")
 
-        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="localhost:22181,localhost:32181,localhost:42181"))
+        cls.cluster = utils.acquire_cluster("cluster-test", FIXTURES_DIR, "cluster-host-ssl.yml", reset=reset_topics("kafka-ssl-1", HOST_ZK + "/ssl"))
 
-    @classmethod
-    def tearDownClass(cls):
-        cls.cluster.shutdown()
-        cls.machine.ssh("sudo rm -rf /tmp/kafka-cluster-host-test/secrets")
+        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers=HOST_ZK))
 
     def test_host_network(self):
         # Test from within the container
@@ -643,33 +734,13 @@ class ClusterSASLHostNetworkTest(ClusterHostNetworkTest):
         cls.machine.ssh(cmd.format(IP=cls.machine.get_internal_ip().strip()))
 
         # Copy SSL files.
-        cls.machine.ssh("mkdir -p /tmp/kafka-cluster-host-test/secrets")
+        copy_secrets(cls.machine, "/tmp/kafka-cluster-host-test")
 
-        local_secrets_dir = os.path.join(FIXTURES_DIR, "secrets")
-        cls.machine.scp_to_machine(local_secrets_dir, "/tmp/kafka-cluster-host-test")
+        # The keytabs are created once, when the cluster starts.
+        cls.cluster = utils.acquire_cluster("cluster-test", FIXTURES_DIR, "cluster-host-sasl.yml",
+                                            reset=reset_topics("kafka-sasl-ssl-1", SASL_HOST_ZK + "/saslssl"), setup=create_host_keytabs)
 
-        cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-host-sasl.yml")
-        cls.cluster.start()
-
-        # Create keytabs
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_broker1", principal="kafka", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_broker2", principal="kafka", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_broker3", principal="kafka", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_producer", principal="host_producer", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="host_consumer", principal="host_consumer", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zookeeper-host-1", principal="zookeeper", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zookeeper-host-2", principal="zookeeper", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zookeeper-host-3", principal="zookeeper", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zkclient-host-1", principal="zkclient", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zkclient-host-2", principal="zkclient", hostname="sasl.kafka.com"))
-        cls.cluster.run_command_on_service("kerberos", KADMIN_KEYTAB_CREATE.format(filename="zkclient-host-3", principal="zkclient", hostname="sasl.kafka.com"))
-
-        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-sasl-1", ZK_READY.format(servers="sasl.kafka.com:22181,sasl.kafka.com:32181,sasl.kafka.com:42181"))
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.cluster.shutdown()
-        cls.machine.ssh("sudo rm -rf /tmp/kafka-cluster-host-test/secrets")
+        assert "PASS" in cls.cluster.run_command_on_service("zookeeper-sasl-1", ZK_READY.format(servers=SASL_HOST_ZK))
 
     def test_host_network(self):
         # Test from within the container
@@ -13,40 +13,33 @@ ZK_READY = "bash -c 'cub zk-ready {servers} 40 && echo PASS || echo FAIL'"
 SR_READY = "bash -c 'cub sr-ready {host} {port} 20 && echo PASS || echo FAIL'"
 
 TOPIC_CREATE = "bash -c ' kafka-topics --create --topic {name} --partitions 1 --replication-factor 1 --if-not-exists --zookeeper $KAFKA_ZOOKEEPER_CONNECT && echo PASS || echo FAIL' "
+TOPIC_DESCRIBE = "bash -c 'kafka-topics --describe --topic {name} --zookeeper $KAFKA_ZOOKEEPER_CONNECT'"
 
-FILE_SOURCE_CONNECTOR_CREATE = """
-    curl -X POST -H "Content-Type: application/json" \
-    --data '{"name": "%s", "config": {"connector.class":"org.apache.kafka.connect.file.FileStreamSourceConnector", "tasks.max":"1", "topic":"%s", "file": "%s"}}' \
-    http://%s:%s/connectors
-"""
+CONNECTORS_APPLY = "/etc/confluent/docker/connectors"
 
-FILE_SINK_CONNECTOR_CREATE = """
-    curl -X POST -H "Content-Type: application/json" \
-    --data '{"name": "%s", "config": {"connector.class":"org.apache.kafka.connect.file.FileStreamSinkConnector", "tasks.max":"1", "topics":"%s", "file": "%s"}}' \
-    http://%s:%s/connectors
-"""
 
-JDBC_SOURCE_CONNECTOR_CREATE = """
-    curl -X POST -H "Content-Type: application/json" --data '{ "name": "%s", "config": { "connector.class": "io.confluent.connect.jdbc.JdbcSourceConnector", "tasks.max": 1, "connection.url": "%s", "mode": "incrementing", "incrementing.column.name": "id", "timestamp.column.name": "modified", "topic.prefix": "%s", "poll.interval.ms": 1000 } }' \
-    http://%s:%s/connectors
-"""
+def file_source_connector(name, topic, file):
+    return {"name": name, "config": {"connector.class": "org.apache.kafka.connect.file.FileStreamSourceConnector", "tasks.max": "1", "topic": topic, "file": file}}
 
-JDBC_SINK_CONNECTOR_CREATE = """
-    curl -X POST -H "Content-Type: application/json" --data '{ "name": "%s", "config": { "connector.class": "io.confluent.connect.jdbc.JdbcSinkConnector", "tasks.max": 1, "connection.url": "%s", "topics": "%s", "auto.create": "true"}}' \
-    http://%s:%s/connectors
-"""
 
-ES_SINK_CONNECTOR_CREATE = """
-    curl -X POST -H "Content-Type: application/json" --data '{ "name": "%s", "config": { "connector.class": "io.confluent.connect.elasticsearch.ElasticsearchSinkConnector", "tasks.max": 1, "connection.url": "%s", "topics": "%s", "key.ignore": "true", "type.name": "kafka-connect"}}' \
-    http://%s:%s/connectors
-"""
+def file_sink_connector(name, topics, file):
+    return {"name": name, "config": {"connector.class": "org.apache.kafka.connect.file.FileStreamSinkConnector", "tasks.max": "1", "topics": topics, "file": file}}
 
-ACTIVEMQ_SOURCE_CONNECTOR_CREATE = """
-    curl -X POST -H "Content-Type: application/json" --data '{ "name": "%s", "config": { "connector.class": "io.confluent.connect.jms.JmsSourceConnector", "tasks.max": 1, "activemq.url": "%s", "jms.destination.name": "testing", "kafka.topic": "%s", "confluent.topic.bootstrap.servers=": "%s"}}' \
-    http://%s:%s/connectors
-"""
 
-CONNECTOR_STATUS = "curl -s -X GET http://{host}:{port}/connectors/{name}/status"
+def jdbc_source_connector(name, connection_url, topic_prefix):
+    return {"name": name, "config": {"connector.class": "io.confluent.connect.jdbc.JdbcSourceConnector", "tasks.max": 1, "connection.url": connection_url, "mode": "incrementing", "incrementing.column.name": "id", "timestamp.column.name": "modified", "topic.prefix": topic_prefix, "poll.interval.ms": 1000}}
+
+
+def jdbc_sink_connector(name, connection_url, topics):
+    return {"name": name, "config": {"connector.class": "io.confluent.connect.jdbc.JdbcSinkConnector", "tasks.max": 1, "connection.url": connection_url, "topics": topics, "auto.create": "true"}}
+
+
+def es_sink_connector(name, connection_url, topics):
+    return {"name": name, "config": {"connector.class": "io.confluent.connect.elasticsearch.ElasticsearchSinkConnector", "tasks.max": 1, "connection.url": connection_url, "topics": topics, "key.ignore": "true", "type.name": "kafka-connect"}}
+
+
+def activemq_source_connector(name, activemq_url, topic, bootstrap_servers):
+    return {"name": name, "config": {"connector.class": "io.confluent.connect.jms.JmsSourceConnector", "tasks.max": 1, "activemq.url": activemq_url, "jms.destination.name": "testing", "kafka.topic": topic, "confluent.topic.bootstrap.servers": bootstrap_servers}}
 
 
 class ConfigTest(unittest.TestCase):
@@ -136,35 +129,66 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(log4j_props.translate(None, string.whitespace), expected_log4j_props.translate(None, string.whitespace))
 
+    def test_plugins_config(self):
+        self.is_connect_healthy_for_service("plugins-config")
+        props = self.cluster.run_command_on_service("plugins-config", "bash -c 'grep plugin.path /etc/kafka-connect/kafka-connect.properties'")
+        self.assertEquals(props.strip(), "plugin.path=/etc/kafka-connect/enabled-plugins")
+        # The variables that only configure the image are not Connect properties.
+        props = self.cluster.run_command_on_service("plugins-config", "cat /etc/kafka-connect/kafka-connect.properties")
+        keys = [line.split("=", 1)[0] for line in props.splitlines()]
+        self.assertFalse("plugins" in keys)
+        self.assertFalse("enabled.plugins.dir" in keys)
+        plugins = self.cluster.run_command_on_service("plugins-config", "ls /etc/kafka-connect/enabled-plugins")
+        self.assertEquals(plugins.split(), ["kafka-connect-jdbc"])
+        connector_plugins = self.cluster.run_command_on_service("plugins-config", "curl -s localhost:8082/connector-plugins")
+        classes = [plugin["class"] for plugin in json.loads(connector_plugins)]
+        self.assertTrue("io.confluent.connect.jdbc.JdbcSourceConnector" in classes)
+        self.assertFalse("io.confluent.connect.elasticsearch.ElasticsearchSinkConnector" in classes)
+
+    def test_unknown_plugin_failure(self):
+        self.assertTrue("Connect plugin kafka-connect-unknown is not in CONNECT_PLUGIN_PATH" in self.cluster.service_logs("failing-config-unknown-plugin", stopped=True))
+
+    def test_perf_profile_config(self):
+        self.is_connect_healthy_for_service("perf-profile")
+        props = self.cluster.run_command_on_service("perf-profile", "bash -c 'cat /etc/kafka-connect/kafka-connect.properties | sort'")
+        # CONNECT_PRODUCER_COMPRESSION_TYPE is set in the environment and wins over the profile.
+        expected = """
+            bootstrap.servers=kafka:9092
+            config.storage.topic=perf-profile.config
+            consumer.fetch.min.bytes=65536
+            consumer.max.poll.records=2000
+            group.id=perf-profile
+            internal.key.converter.schemas.enable=false
+            internal.key.converter=org.apache.kafka.connect.json.JsonConverter
+            internal.value.converter.schemas.enable=false
+            internal.value.converter=org.apache.kafka.connect.json.JsonConverter
+            key.converter=org.apache.kafka.connect.json.JsonConverter
+            offset.storage.topic=perf-profile.offsets
+            producer.batch.size=262144
+            producer.buffer.memory=67108864
+            producer.compression.type=gzip
+            producer.linger.ms=20
+            rest.advertised.host.name=perf-profile
+            rest.port=8082
+            status.storage.topic=perf-profile.status
+            value.converter=org.apache.kafka.connect.json.JsonConverter
+            zookeeper.connect=zookeeper:2181/defaultconfig
+            """
+        self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
 
-def create_connector(name, create_command, host, port):
+    def test_unknown_perf_profile_failure(self):
+        self.assertTrue("CONFLUENT_PERF_PROFILE must be one of: throughput low-latency small-footprint (was 'fastest')." in self.cluster.service_logs("failing-config-perf-profile", stopped=True))
 
-    utils.run_docker_command(
+
+def deploy_connectors(connectors, host, port):
+    # Submits all connectors concurrently and waits for them with one status request per poll, see the connectors script.
+    output = utils.run_docker_command(
         image="confluentinc/cp-kafka-connect",
-        command=create_command,
+        command=[CONNECTORS_APPLY, "--url", "http://%s:%s" % (host, port), "--timeout", "60", "--status-json", "--json", json.dumps(connectors)],
         host_config={'NetworkMode': 'host'})
 
-    status = None
-    for i in xrange(25):
-        source_logs = utils.run_docker_command(
-            image="confluentinc/cp-kafka-connect",
-            command=CONNECTOR_STATUS.format(host=host, port=port, name=name),
-            host_config={'NetworkMode': 'host'})
-
-        connector = json.loads(source_logs)
-        # Retry if you see errors, connect might still be creating the connector.
-        if "error_code" in connector:
-            time.sleep(1)
-        else:
-            status = connector["connector"]["state"]
-            if status == "FAILED":
-                return status
-            elif status == "RUNNING":
-                return status
-            elif status == "UNASSIGNED":
-                time.sleep(1)
-
-    return status
+    # The last line has the state of every connector by name.
+    return json.loads(output.strip().splitlines()[-1])
 
 
 def create_file_source_test_data(host_dir, file, num_records):
@@ -232,12 +256,21 @@ class SingleNodeDistributedTest(unittest.TestCase):
     def is_connect_healthy_for_service(cls, service, port):
         assert "PASS" in cls.cluster.run_command_on_service(service, CONNECT_HEALTH_CHECK.format(host="localhost", port=port))
 
-    def create_topics(self, kafka_service, internal_topic_prefix, data_topic):
-        assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=internal_topic_prefix + ".config"))
-        assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=internal_topic_prefix + ".status"))
-        assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=internal_topic_prefix + ".offsets"))
+    def create_topic(self, kafka_service, data_topic):
+        # The workers create their internal topics before they start.
         assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=data_topic))
 
+    def test_internal_topics_created(self):
+        self.is_connect_healthy_for_service("connect-host-json", 28082)
+        for name, partitions in (("default.config", 1), ("default.offsets", 25), ("default.status", 5)):
+            output = self.cluster.run_command_on_service("kafka-host", TOPIC_DESCRIBE.format(name=name))
+            self.assertTrue("PartitionCount:%d" % partitions in output.translate(None, string.whitespace))
+            self.assertTrue("cleanup.policy=compact" in output)
+        logs = self.cluster.service_logs("connect-host-json", stopped=False)
+        self.assertTrue("===> Creating the internal topics ..." in logs)
+        props = self.cluster.run_command_on_service("connect-host-json", "cat /etc/kafka-connect/kafka-connect.properties")
+        self.assertFalse("cub.create.topics" in [line.split("=", 1)[0] for line in props.splitlines()])
+
     def test_file_connector_on_host_network(self):
 
         data_topic = "one-node-file-test"
@@ -248,8 +281,8 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 28082
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-host", "default", data_topic)
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-host", data_topic)
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-json", 28082)
@@ -258,13 +291,11 @@ class SingleNodeDistributedTest(unittest.TestCase):
         record_count = 10000
         create_file_source_test_data("/tmp/kafka-connect-single-node-test", file_source_input_file, record_count)
 
-        file_source_create_cmd = FILE_SOURCE_CONNECTOR_CREATE % (source_connector_name, data_topic, "/tmp/test/%s" % file_source_input_file, worker_host, worker_port)
-        source_status = create_connector(source_connector_name, file_source_create_cmd, worker_host, worker_port)
-        self.assertEquals(source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % (sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file, worker_host, worker_port)
-        sink_status = create_connector(sink_connector_name, file_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            file_source_connector(source_connector_name, data_topic, "/tmp/test/%s" % file_source_input_file),
+            file_sink_connector(sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file)]
+        states = deploy_connectors(connectors, worker_host, worker_port)
+        self.assertEquals(states, {source_connector_name: "RUNNING", sink_connector_name: "RUNNING"})
 
         sink_op = wait_and_get_sink_output("/tmp/kafka-connect-single-node-test", file_sink_output_file, record_count)
         self.assertEquals(sink_op, record_count)
@@ -279,8 +310,8 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 38082
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-host", "default.avro", data_topic)
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-host", data_topic)
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-avro", 38082)
@@ -289,13 +320,11 @@ class SingleNodeDistributedTest(unittest.TestCase):
         record_count = 10000
         create_file_source_test_data("/tmp/kafka-connect-single-node-test", file_source_input_file, record_count)
 
-        file_source_create_cmd = FILE_SOURCE_CONNECTOR_CREATE % (source_connector_name, data_topic, "/tmp/test/%s" % file_source_input_file, worker_host, worker_port)
-        source_status = create_connector(source_connector_name, file_source_create_cmd, worker_host, worker_port)
-        self.assertEquals(source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % (sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file, worker_host, worker_port)
-        sink_status = create_connector(sink_connector_name, file_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            file_source_connector(source_connector_name, data_topic, "/tmp/test/%s" % file_source_input_file),
+            file_sink_connector(sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file)]
+        states = deploy_connectors(connectors, worker_host, worker_port)
+        self.assertEquals(states, {source_connector_name: "RUNNING", sink_connector_name: "RUNNING"})
 
         sink_op = wait_and_get_sink_output("/tmp/kafka-connect-single-node-test", file_sink_output_file, record_count)
         self.assertEquals(sink_op, record_count)
@@ -309,32 +338,22 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 28082
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-host", "default", data_topic)
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-host", data_topic)
 
         assert "PASS" in self.cluster.run_command_on_service("mysql-host", "bash -c 'mysql -u root -pconfluent < /tmp/sql/mysql-test.sql && echo PASS'")
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-json", 28082)
 
-        jdbc_source_create_cmd = JDBC_SOURCE_CONNECTOR_CREATE % (
-            source_connector_name,
-            "jdbc:mysql://127.0.0.1:3306/connect_test?user=root&password=confluent",
-            jdbc_topic_prefix,
-            worker_host,
-            worker_port)
-
-        jdbc_source_status = create_connector(source_connector_name, jdbc_source_create_cmd, worker_host, worker_port)
-        self.assertEquals(jdbc_source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % (
-            sink_connector_name,
-            data_topic,
-            "/tmp/test/%s" % file_sink_output_file,
-            worker_host,
-            worker_port)
-        sink_status = create_connector(sink_connector_name, file_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            jdbc_source_connector(
+                source_connector_name,
+                "jdbc:mysql://127.0.0.1:3306/connect_test?user=root&password=confluent",
+                jdbc_topic_prefix),
+            file_sink_connector(sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file)]
+        states = deploy_connectors(connectors, worker_host, worker_port)
+        self.assertEquals(states, {source_connector_name: "RUNNING", sink_connector_name: "RUNNING"})
 
         record_count = 10
         sink_op = wait_and_get_sink_output("/tmp/kafka-connect-single-node-test", file_sink_output_file, record_count)
@@ -350,32 +369,22 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 38082
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-host", "default.avro", data_topic)
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-host", data_topic)
 
         assert "PASS" in self.cluster.run_command_on_service("mysql-host", "bash -c 'mysql -u root -pconfluent < /tmp/sql/mysql-test.sql && echo PASS'")
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-avro", 38082)
 
-        jdbc_source_create_cmd = JDBC_SOURCE_CONNECTOR_CREATE % (
-            source_connector_name,
-            "jdbc:mysql://127.0.0.1:3306/connect_test?user=root&password=confluent",
-            jdbc_topic_prefix,
-            worker_host,
-            worker_port)
-
-        jdbc_source_status = create_connector(source_connector_name, jdbc_source_create_cmd, worker_host, worker_port)
-        self.assertEquals(jdbc_source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % (
-            sink_connector_name,
-            data_topic,
-            "/tmp/test/%s" % file_sink_output_file,
-            worker_host,
-            worker_port)
-        sink_status = create_connector(sink_connector_name, file_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            jdbc_source_connector(
+                source_connector_name,
+                "jdbc:mysql://127.0.0.1:3306/connect_test?user=root&password=confluent",
+                jdbc_topic_prefix),
+            file_sink_connector(sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file)]
+        states = deploy_connectors(connectors, worker_host, worker_port)
+        self.assertEquals(states, {source_connector_name: "RUNNING", sink_connector_name: "RUNNING"})
 
         record_count = 10
         sink_op = wait_and_get_sink_output("/tmp/kafka-connect-single-node-test", file_sink_output_file, record_count)
@@ -388,8 +397,8 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 38082
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-host", "default.avro", topic)
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-host", topic)
 
         # Create the database.
         assert "PASS" in self.cluster.run_command_on_service("mysql-host", "bash -c 'mysql -u root -pconfluent < /tmp/sql/mysql-test.sql && echo PASS'")
@@ -399,15 +408,13 @@ class SingleNodeDistributedTest(unittest.TestCase):
 
         assert "PASS" in self.cluster.run_command_on_service("connect-host-avro", 'bash -c "TOPIC=%s sh /tmp/test/scripts/produce-data-avro.sh"' % topic)
 
-        jdbc_sink_create_cmd = JDBC_SINK_CONNECTOR_CREATE % (
-            sink_connector_name,
-            "jdbc:mysql://127.0.0.1:3306/connect_test?user=root&password=confluent",
-            topic,
-            worker_host,
-            worker_port)
-
-        jdbc_sink_status = create_connector(sink_connector_name, jdbc_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(jdbc_sink_status, "RUNNING")
+        connectors = [
+            jdbc_sink_connector(
+                sink_connector_name,
+                "jdbc:mysql://127.0.0.1:3306/connect_test?user=root&password=confluent",
+                topic)]
+        states = deploy_connectors(connectors, worker_host, worker_port)
+        self.assertEquals(states, {sink_connector_name: "RUNNING"})
 
         assert "PASS" in self.cluster.run_command_on_service("mysql-host", """ bash -c "mysql --user=root --password=confluent --silent -e 'show databases;' | grep connect_test && echo PASS || echo FAIL" """)
 
@@ -429,22 +436,15 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 38082
 
-        self.create_topics("kafka-host", "default.avro", topic)
+        self.create_topic("kafka-host", topic)
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-avro", 38082)
 
         assert "PASS" in self.cluster.run_command_on_service("connect-host-avro", 'bash -c "TOPIC=%s sh /tmp/test/scripts/produce-data-avro.sh"' % topic)
 
-        es_sink_create_cmd = ES_SINK_CONNECTOR_CREATE % (
-            sink_connector_name,
-            "http://localhost:9200",
-            topic,
-            worker_host,
-            worker_port)
-
-        es_sink_status = create_connector(sink_connector_name, es_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(es_sink_status, "RUNNING")
+        states = deploy_connectors([es_sink_connector(sink_connector_name, "http://localhost:9200", topic)], worker_host, worker_port)
+        self.assertEquals(states, {sink_connector_name: "RUNNING"})
 
         tmp = ""
         for i in xrange(25):
@@ -468,33 +468,19 @@ class SingleNodeDistributedTest(unittest.TestCase):
         worker_host = "localhost"
         worker_port = 38082
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-host", "default.avro", data_topic)
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-host", data_topic)
 
         assert "PASS" in self.cluster.run_command_on_service("activemq-host", "bash -c 'bin/activemq producer --message MyMessage --messageCount 1000 --destination queue://TEST' | grep 'Produced: 1000 messages' && echo PASS || echo FAIL")
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-avro", 38082)
 
-        activemq_source_create_cmd = ACTIVEMQ_SOURCE_CONNECTOR_CREATE % (
-            source_connector_name,
-            "tcp://127.0.0.1:61616",
-            data_topic,
-            "localhost:9092",
-            worker_host,
-            worker_port)
-
-        activemq_source_status = create_connector(source_connector_name, activemq_source_create_cmd, worker_host, worker_port)
-        self.assertEquals(activemq_source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % (
-            sink_connector_name,
-            data_topic,
-            "/tmp/test/%s" % file_sink_output_file,
-            worker_host,
-            worker_port)
-        sink_status = create_connector(sink_connector_name, file_sink_create_cmd, worker_host, worker_port)
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            activemq_source_connector(source_connector_name, "tcp://127.0.0.1:61616", data_topic, "localhost:9092"),
+            file_sink_connector(sink_connector_name, data_topic, "/tmp/test/%s" % file_sink_output_file)]
+        states = deploy_connectors(connectors, worker_host, worker_port)
+        self.assertEquals(states, {source_connector_name: "RUNNING", sink_connector_name: "RUNNING"})
 
         record_count = 1000
         sink_op = wait_and_get_sink_output("/tmp/kafka-connect-single-node-test", file_sink_output_file, record_count)
@@ -521,10 +507,8 @@ class ClusterHostNetworkTest(unittest.TestCase):
         cls.machine.ssh("sudo rm -rf /tmp/kafka-connect-host-cluster-test")
         cls.cluster.shutdown()
 
-    def create_topics(self, kafka_service, internal_topic_prefix, data_topic):
-        assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=internal_topic_prefix + ".config"))
-        assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=internal_topic_prefix + ".status"))
-        assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=internal_topic_prefix + ".offsets"))
+    def create_topic(self, kafka_service, data_topic):
+        # The workers create their internal topics before they start.
         assert "PASS" in self.cluster.run_command_on_service(kafka_service, TOPIC_CREATE.format(name=data_topic))
 
     def test_cluster_running(self):
@@ -536,8 +520,8 @@ class ClusterHostNetworkTest(unittest.TestCase):
 
     def test_file_connector(self):
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-1", "default", "cluster-host-file-test")
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-1", "cluster-host-file-test")
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-1", 28082)
@@ -548,21 +532,19 @@ class ClusterHostNetworkTest(unittest.TestCase):
         record_count = 10000
         create_file_source_test_data("/tmp/connect-cluster-host-file-test", "source.test.txt", record_count)
 
-        file_source_create_cmd = FILE_SOURCE_CONNECTOR_CREATE % ("cluster-host-source-test", "cluster-host-file-test", "/tmp/test/source.test.txt", "localhost", "28082")
-        source_status = create_connector("cluster-host-source-test", file_source_create_cmd, "localhost", "28082")
-        self.assertEquals(source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % ("cluster-host-sink-test", "cluster-host-file-test", "/tmp/test/sink.test.txt", "localhost", "38082")
-        sink_status = create_connector("cluster-host-sink-test", file_sink_create_cmd, "localhost", "38082")
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            file_source_connector("cluster-host-source-test", "cluster-host-file-test", "/tmp/test/source.test.txt"),
+            file_sink_connector("cluster-host-sink-test", "cluster-host-file-test", "/tmp/test/sink.test.txt")]
+        states = deploy_connectors(connectors, "localhost", "28082")
+        self.assertEquals(states, {"cluster-host-source-test": "RUNNING", "cluster-host-sink-test": "RUNNING"})
 
         sink_op = wait_and_get_sink_output("/tmp/connect-cluster-host-file-test", "sink.test.txt", record_count)
         self.assertEquals(sink_op, record_count)
 
     def test_file_connector_with_avro(self):
 
-        # Creating topics upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
-        self.create_topics("kafka-1", "default.avro", "cluster-host-avro-file-test")
+        # Creating the topic upfront makes the tests go a lot faster (I suspect this is because consumers dont waste time with rebalances)
+        self.create_topic("kafka-1", "cluster-host-avro-file-test")
 
         # Test from within the container
         self.is_connect_healthy_for_service("connect-host-avro-1", 28083)
@@ -573,13 +555,11 @@ class ClusterHostNetworkTest(unittest.TestCase):
         record_count = 10000
         create_file_source_test_data("/tmp/connect-cluster-host-file-test", "source.avro.test.txt", record_count)
 
-        file_source_create_cmd = FILE_SOURCE_CONNECTOR_CREATE % ("cluster-host-source-test", "cluster-host-avro-file-test", "/tmp/test/source.avro.test.txt", "localhost", "28083")
-        source_status = create_connector("cluster-host-source-test", file_source_create_cmd, "localhost", "28083")
-        self.assertEquals(source_status, "RUNNING")
-
-        file_sink_create_cmd = FILE_SINK_CONNECTOR_CREATE % ("cluster-host-sink-test", "cluster-host-avro-file-test", "/tmp/test/sink.avro.test.txt", "localhost", "38083")
-        sink_status = create_connector("cluster-host-sink-test", file_sink_create_cmd, "localhost", "38083")
-        self.assertEquals(sink_status, "RUNNING")
+        connectors = [
+            file_source_connector("cluster-host-source-test", "cluster-host-avro-file-test", "/tmp/test/source.avro.test.txt"),
+            file_sink_connector("cluster-host-sink-test", "cluster-host-avro-file-test", "/tmp/test/sink.avro.test.txt")]
+        states = deploy_connectors(connectors, "localhost", "28083")
+        self.assertEquals(states, {"cluster-host-source-test": "RUNNING", "cluster-host-sink-test": "RUNNING"})
 
         sink_op = wait_and_get_sink_output("/tmp/connect-cluster-host-file-test", "sink.avro.test.txt", record_count)
         self.assertEquals(sink_op, record_count)
@@ -48,6 +48,7 @@ class ConfigTest(unittest.TestCase):
 
     def test_required_config_failure(self):
         self.assertTrue("one of (KAFKA_REST_ZOOKEEPER_CONNECT,KAFKA_REST_BOOTSTRAP_SERVERS) is required." in self.cluster.service_logs("failing-config", stopped=True))
+        self.assertTrue("CONFLUENT_PERF_PROFILE must be one of: throughput low-latency small-footprint (was 'fastest')." in self.cluster.service_logs("failing-config-perf-profile", stopped=True))
 
     def test_default_config(self):
         self.is_kafka_rest_healthy_for_service("default-config")
@@ -80,13 +81,26 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(log4j_props.translate(None, string.whitespace), expected_log4j_props.translate(None, string.whitespace))
 
+    def test_perf_profile_config(self):
+        self.is_kafka_rest_healthy_for_service("perf-profile")
+        props = self.cluster.run_command_on_service("perf-profile", "bash -c 'cat /etc/kafka-rest/kafka-rest.properties | sort'")
+        # KAFKA_REST_PRODUCER_LINGER_MS is set in the environment and wins over the profile.
+        expected = """
+            bootstrap.servers=PLAINTEXT://kafka:9092
+            host.name=perf-profile
+            producer.batch.size=262144
+            producer.compression.type=lz4
+            producer.linger.ms=5
+            producer.threads=10
+            """
+        self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
+
 
 class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-bridge", ZK_READY.format(servers="localhost:2181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-host", ZK_READY.format(servers="localhost:32181"))
         assert "PASS" in cls.cluster.run_command_on_service("kafka-bridge", KAFKA_READY.format(brokers=1))
@@ -94,7 +108,7 @@ class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_kafka_rest_healthy_for_service(cls, service, port=8082):
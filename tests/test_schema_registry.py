@@ -82,8 +82,7 @@ class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-bridge", ZK_READY.format(servers="localhost:2181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-host", ZK_READY.format(servers="localhost:32181"))
         assert "PASS" in cls.cluster.run_command_on_service("kafka-bridge", KAFKA_READY.format(brokers=1))
@@ -91,7 +90,7 @@ class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_schema_registry_healthy_for_service(cls, service, port=8081):
@@ -157,8 +156,7 @@ class ClusterBridgedNetworkTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("cluster-bridged-test", FIXTURES_DIR, "cluster-bridged-plain.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("cluster-bridged-test", FIXTURES_DIR, "cluster-bridged-plain.yml")
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-2", ZK_READY.format(servers="zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-3", ZK_READY.format(servers="zookeeper-1:2181,zookeeper-2:2181,zookeeper-3:2181"))
@@ -168,7 +166,7 @@ class ClusterBridgedNetworkTest(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_schema_registry_healthy_for_service(cls, service, port=8081):
@@ -258,8 +256,7 @@ class ClusterHostNetworkTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("cluster-host-test", FIXTURES_DIR, "cluster-host-plain.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("cluster-host-test", FIXTURES_DIR, "cluster-host-plain.yml")
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-1", ZK_READY.format(servers="localhost:22181,localhost:32181,localhost:42181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-2", ZK_READY.format(servers="localhost:22181,localhost:32181,localhost:42181"))
         assert "PASS" in cls.cluster.run_command_on_service("zookeeper-3", ZK_READY.format(servers="localhost:22181,localhost:32181,localhost:42181"))
@@ -269,7 +266,7 @@ class ClusterHostNetworkTest(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_schema_registry_healthy_for_service(cls, service):
@@ -1,3 +1,4 @@
+import json
 import os
 import unittest
 import utils
@@ -56,6 +57,7 @@ class ConfigTest(unittest.TestCase):
     def test_required_config_failure(self):
         self.assertTrue("ZOOKEEPER_CLIENT_PORT is required." in self.cluster.service_logs("failing-config", stopped=True))
         self.assertTrue("ZOOKEEPER_SERVER_ID is required." in self.cluster.service_logs("failing-config-server-id", stopped=True))
+        self.assertTrue("CONFLUENT_PERF_PROFILE must be one of: throughput low-latency small-footprint (was 'fastest')." in self.cluster.service_logs("failing-config-perf-profile", stopped=True))
 
     def test_default_config(self):
         self.is_zk_healthy_for_service("default-config", 2181)
@@ -141,6 +143,26 @@ class ConfigTest(unittest.TestCase):
     def test_random_user(self):
         self.is_zk_healthy_for_service("random-user", 2181)
 
+    def test_perf_profile_config(self):
+        self.is_zk_healthy_for_service("perf-profile", 2181)
+        zk_props = self.cluster.run_command_on_service("perf-profile", "bash -c 'cat /etc/kafka/zookeeper.properties | sort'")
+        # ZOOKEEPER_SNAP_COUNT is set in the environment and wins over the profile.
+        expected = """clientPort=2181
+            dataDir=/var/lib/zookeeper/data
+            dataLogDir=/var/lib/zookeeper/log
+            globalOutstandingLimit=2000
+            preAllocSize=131072
+            snapCount=50000
+            """
+        self.assertEquals(zk_props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
+
+    def test_gc_logging(self):
+        self.is_zk_healthy_for_service("gc-logging", 2181)
+        logs = self.cluster.run_command_on_service("gc-logging", "ls /var/log/confluent/gc")
+        self.assertTrue("zookeeper-gc.log" in logs)
+        summary = json.loads(self.cluster.run_command_on_service("gc-logging", "/etc/confluent/docker/gc-pauses --json"))
+        self.assertTrue(summary["count"] > 0)
+
     def test_kitchen_sink(self):
         self.is_zk_healthy_for_service("kitchen-sink", 22181)
         zk_props = self.cluster.run_command_on_service("kitchen-sink", "cat /etc/kafka/zookeeper.properties")
@@ -163,12 +185,11 @@ class StandaloneNetworkingTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.cluster = utils.TestCluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
-        cls.cluster.start()
+        cls.cluster = utils.acquire_cluster("standalone-network-test", FIXTURES_DIR, "standalone-network.yml")
 
     @classmethod
     def tearDownClass(cls):
-        cls.cluster.shutdown()
+        utils.release_cluster(cls.cluster)
 
     @classmethod
     def is_zk_healthy_for_service(cls, service, client_port, host="localhost"):
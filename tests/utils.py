@@ -1,5 +1,9 @@
+import atexit
 import docker
+import hashlib
+import math
 import os
+import socket
 import time
 from compose.container import Container
 from compose.config.config import ConfigDetails
@@ -11,39 +15,126 @@ from compose.config.environment import Environment
 from compose.container import Container
 import json
 import subprocess
+import threading
+import Queue
+
+# Shared clients, created lazily. Each client owns a requests session, so reusing
+# it keeps the HTTP connection pool (and the negotiated API version) alive across
+# calls instead of reconnecting for every helper invocation.
+_docker_client = None
+_compose_client = None
+
+
+def get_docker_client():
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env(assert_hostname=False)
+    return _docker_client
+
+
+def get_compose_client():
+    global _compose_client
+    if _compose_client is None:
+        _compose_client = docker_client(Environment())
+    return _compose_client
+
+
+def reset_clients():
+    """Drop the shared clients so that the next call reconnects."""
+    global _docker_client, _compose_client
+    for client in (_docker_client, _compose_client):
+        if client is not None:
+            client.close()
+    _docker_client = None
+    _compose_client = None
 
 
 def build_image(image_name, dockerfile_dir):
+    # The base Dockerfile uses BuildKit cache mounts, which the builder of the Docker API client does not support,
+    # so the image is built with the docker CLI. A failed build raises CalledProcessError.
     print("Building image %s from %s" % (image_name, dockerfile_dir))
-    client = docker.from_env(assert_hostname=False)
-    output = client.build(dockerfile_dir, rm=True, tag=image_name)
-    response = "".join(["     %s" % (line,) for line in output])
-    print(response)
+    env = dict(os.environ, DOCKER_BUILDKIT="1")
+    subprocess.check_call(["docker", "build", "--rm", "-t", image_name, dockerfile_dir], env=env)
 
 
 def image_exists(image_name):
-    client = docker.from_env(assert_hostname=False)
+    client = get_docker_client()
     tags = [t for image in client.images() for t in image['RepoTags']]
     return "%s:%s" % (image_name, "latest") in tags
 
 
 def pull_image(image_name):
-    client = docker.from_env(assert_hostname=False)
+    client = get_docker_client()
     if not image_exists(image_name):
         client.pull(image_name)
 
 
-def run_docker_command(timeout=None, **kwargs):
+def matches(line, until):
+    """`until` is a substring, a compiled regular expression or a function taking the line."""
+    if until is None:
+        return False
+    if callable(until):
+        return until(line)
+    if hasattr(until, "search"):
+        return until.search(line) is not None
+    return until in line
+
+
+def iter_lines(chunks):
+    """Splits a stream of output chunks into lines, keeping the line endings."""
+    buf = ""
+    for chunk in chunks:
+        buf += chunk
+        while "\n" in buf:
+            line, buf = buf.split("\n", 1)
+            yield line + "\n"
+    if buf:
+        yield buf
+
+
+def stream_docker_command(timeout=None, until=None, **kwargs):
+    """
+    Runs a container like run_docker_command and yields its output line by line as it is written. Stops after
+    the first line matching `until` (see matches) or when the container exits. The container is stopped `timeout`
+    seconds after it started, and a RuntimeError is raised once its output is consumed. The container is removed
+    when the generator is exhausted or closed.
+    """
     pull_image(kwargs["image"])
-    client = docker.from_env(assert_hostname=False)
+    client = get_docker_client()
     kwargs["labels"] = {"io.confluent.docker.testing": "true"}
     container = TestContainer.create(client, **kwargs)
     container.start()
-    container.wait(timeout)
-    logs = container.logs()
-    print "Running command %s: %s" % (kwargs["command"], logs)
-    container.shutdown()
-    return logs
+    watchdog = None
+    timed_out = threading.Event()
+    if timeout:
+        def stop():
+            timed_out.set()
+            # Stopping the container ends the log stream.
+            container.stop()
+        watchdog = threading.Timer(timeout, stop)
+        watchdog.daemon = True
+        watchdog.start()
+    try:
+        for line in iter_lines(container.logs(stream=True, follow=True)):
+            yield line
+            if matches(line, until):
+                return
+        if timed_out.is_set():
+            raise RuntimeError("Command %s timed out after %ss" % (kwargs["command"], timeout))
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        container.shutdown()
+
+
+def run_docker_command(timeout=None, until=None, **kwargs):
+    lines = []
+    try:
+        for line in stream_docker_command(timeout, until, **kwargs):
+            lines.append(line)
+    finally:
+        print "Running command %s: %s" % (kwargs["command"], "".join(lines))
+    return "".join(lines)
 
 
 def path_exists_in_image(image, path):
@@ -89,6 +180,282 @@ class TestContainer(Container):
         return self.client.wait(self.id, timeout)
 
 
+class WaitCondition():
+
+    def __init__(self, container_id, description, predicate=None):
+        self.container_id = container_id
+        self.description = description
+        self.predicate = predicate
+        self.ok = None
+        self.done = threading.Event()
+
+    def finish(self, ok):
+        if not self.done.is_set():
+            self.ok = ok
+            self.done.set()
+
+    def __repr__(self):
+        return "%s on %s" % (self.description, self.container_id[:12])
+
+
+class EventWaiter():
+    """
+    Waits for many container conditions at once, using a single subscription to the Docker events stream
+    instead of one blocking wait per container.
+
+        waiter = EventWaiter()
+        conditions = [waiter.exited(c, 1) for c in containers] + [waiter.log_matches(other, "started")]
+        assert waiter.wait(conditions, 60)
+
+    Each condition is also checked against the current container state when it is created, so conditions
+    that were met before the waiter existed are not missed.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_docker_client()
+        self.lock = threading.Lock()
+        self.conditions = []
+        self.history = []
+        self.closed = False
+        self.since = int(time.time())
+        # The events request is made here rather than through client.events, which does not expose the response,
+        # so that close() can close the stream.
+        params = {"since": self.since, "filters": docker.utils.convert_filters({"type": "container"})}
+        self.response = self.client._get(self.client._url("/events"), params=params, stream=True)
+        self.client._raise_for_status(self.response)
+        self.thread = threading.Thread(target=self._listen)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _listen(self):
+        try:
+            for event in self.client._stream_helper(self.response, decode=True):
+                if self.closed:
+                    return
+                with self.lock:
+                    self.history.append(event)
+                    for condition in list(self.conditions):
+                        self._dispatch(condition, event)
+        except Exception:
+            # Closing the response interrupts the blocked read.
+            if not self.closed:
+                raise
+
+    def _dispatch(self, condition, event):
+        if event.get("id") != condition.container_id:
+            return
+        ok = condition.predicate(event)
+        if ok is not None:
+            condition.finish(ok)
+            self.conditions.remove(condition)
+
+    def _add(self, condition, state_check):
+        with self.lock:
+            self.conditions.append(condition)
+            for event in self.history:
+                if condition in self.conditions:
+                    self._dispatch(condition, event)
+        if not condition.done.is_set():
+            state = self.client.inspect_container(condition.container_id)["State"]
+            ok = state_check(state)
+            if ok is not None:
+                with self.lock:
+                    if condition in self.conditions:
+                        self.conditions.remove(condition)
+                condition.finish(ok)
+        return condition
+
+    def started(self, container):
+        condition = WaitCondition(container_id(container), "started",
+                                  lambda event: True if event.get("status") == "start" else None)
+        return self._add(condition, lambda state: True if state["Running"] else None)
+
+    def healthy(self, container):
+        condition = WaitCondition(container_id(container), "healthy",
+                                  lambda event: True if event.get("status") == "health_status: healthy" else None)
+        return self._add(condition, lambda state: True if state.get("Health", {}).get("Status") == "healthy" else None)
+
+    def exited(self, container, exit_code=None):
+        """Met when the container exits, with `exit_code` if given. Exiting with another code fails the condition."""
+        cid = container_id(container)
+
+        def on_event(event):
+            if event.get("status") != "die":
+                return None
+            code = event.get("Actor", {}).get("Attributes", {}).get("exitCode")
+            if code is None:
+                code = self.client.inspect_container(cid)["State"]["ExitCode"]
+            return exit_code is None or int(code) == exit_code
+
+        def on_state(state):
+            if state["Running"] or state.get("FinishedAt", "").startswith("0001-"):
+                return None
+            return exit_code is None or state["ExitCode"] == exit_code
+
+        description = "exited" if exit_code is None else "exited with %s" % exit_code
+        return self._add(WaitCondition(cid, description, on_event), on_state)
+
+    def log_matches(self, container, until):
+        """Met when a log line matches `until` (see matches), fails if the container exits before that."""
+        condition = WaitCondition(container_id(container), "log line matching %s" % getattr(until, "pattern", until))
+
+        def follow():
+            try:
+                for line in iter_lines(self.client.logs(condition.container_id, stream=True, follow=True)):
+                    if condition.done.is_set():
+                        return
+                    if matches(line, until):
+                        condition.finish(True)
+                        return
+            except Exception as e:
+                print "Following logs of %s failed: %s" % (condition.container_id, e)
+            condition.finish(False)
+
+        thread = threading.Thread(target=follow)
+        thread.daemon = True
+        thread.start()
+        return condition
+
+    def wait(self, conditions, timeout=None):
+        """Waits until all conditions are met, one fails or `timeout` seconds pass. Returns True if all were met."""
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            failed = [c for c in conditions if c.done.is_set() and not c.ok]
+            if failed:
+                print "Condition failed: %s" % ", ".join("%s" % c for c in failed)
+                return False
+            pending = [c for c in conditions if not c.done.is_set()]
+            if not pending:
+                return True
+            remaining = deadline - time.time() if deadline else 1
+            if remaining <= 0:
+                print "Timed out after %ss waiting for: %s" % (timeout, ", ".join("%s" % c for c in pending))
+                return False
+            # An Event.wait() without a timeout can not be interrupted on python 2.
+            pending[0].done.wait(min(0.5, remaining))
+
+    def close(self):
+        self.closed = True
+        # The events stream blocks until the next event, shutting the socket down wakes the listener thread up.
+        try:
+            self.client._get_raw_response_socket(self.response).shutdown(socket.SHUT_RDWR)
+        except (socket.error, AttributeError):
+            pass
+        self.response.close()
+        self.thread.join(5)
+        with self.lock:
+            for condition in self.conditions:
+                condition.finish(False)
+            del self.conditions[:]
+
+
+def container_id(container):
+    return getattr(container, "id", container)
+
+
+def percentile(values, p):
+    """Nearest rank percentile of a non empty list."""
+    values = sorted(values)
+    return values[max(0, int(math.ceil(p / 100.0 * len(values))) - 1)]
+
+
+def stats_sample(stats):
+    """Extracts a sample from a Docker stats API response. Counters (block I/O, network) are totals since start."""
+    cpu, precpu = stats["cpu_stats"], stats.get("precpu_stats", {})
+    cpu_delta = cpu["cpu_usage"]["total_usage"] - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    cpus = cpu.get("online_cpus") or len(cpu["cpu_usage"].get("percpu_usage") or [None])
+    memory = stats.get("memory_stats", {})
+    memory_stats = memory.get("stats", {})
+    blkio = stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or []
+    networks = (stats.get("networks") or {}).values()
+    return {
+        "timestamp": time.time(),
+        "cpu_percent": 100.0 * cpu_delta / system_delta * cpus if system_delta > 0 and cpu_delta > 0 else 0.0,
+        # cgroup v1 reports rss and cache, cgroup v2 anon and file.
+        "rss_bytes": memory_stats.get("rss", memory_stats.get("anon", 0)),
+        "cache_bytes": memory_stats.get("cache", memory_stats.get("file", 0)),
+        "memory_usage_bytes": memory.get("usage", 0),
+        "memory_limit_bytes": memory.get("limit", 0),
+        "block_read_bytes": sum(entry["value"] for entry in blkio if entry["op"].lower() == "read"),
+        "block_write_bytes": sum(entry["value"] for entry in blkio if entry["op"].lower() == "write"),
+        "network_rx_bytes": sum(network.get("rx_bytes", 0) for network in networks),
+        "network_tx_bytes": sum(network.get("tx_bytes", 0) for network in networks),
+    }
+
+
+class ResourceProfiler():
+    """
+    Samples the Docker stats API of a set of containers (about once a second) until stopped.
+
+        profiler = ResourceProfiler(cluster.get_project().containers())
+        ...
+        profile = profiler.stop()
+
+    The profile has the samples of every container, by container name (so the containers of a scaled service are
+    kept apart), and a summary: percentiles of CPU, RSS, page cache and memory usage, and the block I/O and network
+    bytes over the profiled period.
+    """
+
+    GAUGES = ["cpu_percent", "rss_bytes", "cache_bytes", "memory_usage_bytes"]
+    COUNTERS = ["block_read_bytes", "block_write_bytes", "network_rx_bytes", "network_tx_bytes"]
+
+    def __init__(self, containers, client=None):
+        self.client = client or get_docker_client()
+        self.services = dict((container.name, container.service) for container in containers)
+        self.samples = dict((container.name, []) for container in containers)
+        self.stopped = threading.Event()
+        self.threads = []
+        for container in containers:
+            thread = threading.Thread(target=self._sample, args=(container.id, self.samples[container.name]))
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def _sample(self, container_id, samples):
+        try:
+            for stats in self.client.stats(container_id, decode=True, stream=True):
+                if self.stopped.is_set():
+                    return
+                samples.append(stats_sample(stats))
+        except Exception as e:
+            if not self.stopped.is_set():
+                print "Sampling stats of %s failed: %s" % (container_id, e)
+
+    def stop(self):
+        self.stopped.set()
+        # A stats stream only returns with its next sample, don't wait for all of them.
+        for thread in self.threads:
+            thread.join(0.1)
+        containers = {}
+        for name, samples in self.samples.items():
+            containers[name] = self.summarize(samples)
+            containers[name]["service"] = self.services[name]
+        return {"containers": containers}
+
+    def summarize(self, samples):
+        samples = list(samples)
+        summary = {}
+        if samples:
+            for gauge in self.GAUGES:
+                values = [sample[gauge] for sample in samples]
+                summary[gauge] = dict(("p%s" % p, percentile(values, p)) for p in (50, 90, 99))
+                summary[gauge]["max"] = max(values)
+            for counter in self.COUNTERS:
+                summary[counter] = samples[-1][counter] - samples[0][counter]
+            summary["duration_seconds"] = samples[-1]["timestamp"] - samples[0]["timestamp"]
+        return {"samples": samples, "summary": summary}
+
+
+# Images to run instead of the ones named in the fixtures, by image name without tag. For example
+# {"confluentinc/cp-kafka": "confluentinc/cp-server"} runs the Kafka fixtures against cp-server.
+IMAGE_OVERRIDES = {}
+
+# When set, every TestCluster profiles the resource usage of its containers from start() to shutdown() and writes
+# the profile to this directory.
+PROFILE_RESOURCES_DIR = os.environ.get("PROFILE_RESOURCES_DIR")
+
+
 class TestCluster():
 
     def __init__(self, name, working_dir, config_file):
@@ -96,16 +463,62 @@ class TestCluster():
         cfg_file = ConfigFile.from_filename(config_file_path)
         c = ConfigDetails(working_dir, [cfg_file],)
         self.cd = load(c)
+        for service in self.cd.services:
+            image, _, tag = service.get("image", "").partition(":")
+            if image in IMAGE_OVERRIDES:
+                service["image"] = IMAGE_OVERRIDES[image] + (":" + tag if tag else "")
         self.name = name
+        self.working_dir = working_dir
+        self.config_file = config_file
+        self._project = None
+        self._profiler = None
 
     def get_project(self):
-        # Dont reuse the client to fix this bug : https://github.com/docker/compose/issues/1275
-        client = docker_client(Environment())
-        project = Project.from_config(self.name, self.cd, client)
-        return project
+        if self._project is None:
+            self._project = Project.from_config(self.name, self.cd, get_compose_client())
+        return self._project
+
+    def invalidate_project(self, reset_client=False):
+        # A long lived client can end up with stale connections after the containers it talked to
+        # are recreated, see https://github.com/docker/compose/issues/1275. Call this (with
+        # reset_client=True) to force a fresh project and client on the next call.
+        self._project = None
+        if reset_client:
+            reset_clients()
 
     def start(self):
+        # Idle pooled clusters may use the same project name or host ports.
+        CLUSTER_POOL.make_room(self)
         self.get_project().up()
+        self.invalidate_project()
+        if PROFILE_RESOURCES_DIR:
+            self.start_profiling()
+
+    def start_profiling(self):
+        """Samples the resource usage of the running containers until stop_profiling() or shutdown()."""
+        self._profiler = ResourceProfiler(self.get_project().containers(), self.get_project().client)
+
+    def stop_profiling(self):
+        """
+        Returns the resource profile (see ResourceProfiler). With PROFILE_RESOURCES_DIR set, the profile is also
+        written to <PROFILE_RESOURCES_DIR>/<component>-<name>-<fixture>.json, the component being the fixture directory.
+        """
+        if self._profiler is None:
+            return None
+        profile = self._profiler.stop()
+        self._profiler = None
+        component = os.path.basename(os.path.normpath(self.working_dir))
+        profile["cluster"] = self.name
+        profile["component"] = component
+        profile["fixture"] = self.config_file
+        if PROFILE_RESOURCES_DIR:
+            if not os.path.isdir(PROFILE_RESOURCES_DIR):
+                os.makedirs(PROFILE_RESOURCES_DIR)
+            path = os.path.join(PROFILE_RESOURCES_DIR, "%s-%s-%s.json" % (component, self.name, os.path.splitext(self.config_file)[0]))
+            with open(path, "w") as f:
+                json.dump(profile, f, indent=2, sort_keys=True)
+            print "Resource profile written to %s" % path
+        return profile
 
     def is_running(self):
         state = [container.is_running for container in self.get_project().containers()]
@@ -115,9 +528,11 @@ class TestCluster():
         return self.get_container(service_name).is_running
 
     def shutdown(self):
+        self.stop_profiling()
         project = self.get_project()
         project.stop()
         project.remove_stopped()
+        self.invalidate_project()
 
     def get_container(self, service_name, stopped=False):
         return self.get_project().get_service(service_name).get_container()
@@ -131,8 +546,17 @@ class TestCluster():
         if container[0].is_running:
             return self.get_project().client.wait(container[0].id, timeout)
 
-    def run_command_on_service(self, service_name, command):
-        return self.run_command(command, self.get_container(service_name))
+    def wait_for_exit(self, service_names, timeout=None, exit_code=None):
+        """Waits for the containers of all services to exit, with a single events subscription."""
+        waiter = EventWaiter(self.get_project().client)
+        try:
+            containers = self.get_project().containers(service_names, stopped=True)
+            return waiter.wait([waiter.exited(container, exit_code) for container in containers], timeout)
+        finally:
+            waiter.close()
+
+    def run_command_on_service(self, service_name, command, until=None):
+        return self.run_command(command, self.get_container(service_name), until)
 
     def service_logs(self, service_name, stopped=False):
         if stopped:
@@ -142,20 +566,212 @@ class TestCluster():
         else:
             return self.get_container(service_name).logs()
 
-    def run_command(self, command, container):
+    def run_command(self, command, container, until=None):
         print "Running %s on %s :" % (command, container)
-        eid = container.create_exec(command)
-        output = container.start_exec(eid)
+        output = "".join(self.stream_command(command, container, until))
         print "\n%s " % output
         return output
 
-    def run_command_on_all(self, command):
+    def stream_command(self, command, container, until=None):
+        """
+        Yields the output of the command line by line as it is written, stopping after the first line matching
+        `until` (see matches). The command itself keeps running in the container after an early stop.
+        """
+        eid = container.create_exec(command)
+        for line in iter_lines(container.start_exec(eid, stream=True)):
+            yield line
+            if matches(line, until):
+                return
+
+    def run_command_on_all(self, command, timeout=None, workers=None):
         results = {}
-        for container in self.get_project().containers():
-            results[container.name_without_project] = self.run_command(command, container)
+        for name, output, timed_out in self.iter_command_on_all(command, timeout, workers):
+            results[name] = output
 
         return results
 
+    def iter_command_on_all(self, command, timeout=None, workers=None):
+        """
+        Runs the command on all containers concurrently, using at most `workers` threads (default: one per
+        container). Yields (name, output, timed_out) tuples in the order the commands complete. A command that
+        has not completed `timeout` seconds after the fan-out started is yielded with the output streamed so far
+        and timed_out=True.
+        """
+        containers = self.get_project().containers()
+        if not containers:
+            return
+        results = Queue.Queue()
+        slots = threading.BoundedSemaphore(workers or len(containers))
+        outputs = dict((container.name_without_project, []) for container in containers)
+
+        def run(container):
+            name = container.name_without_project
+            with slots:
+                try:
+                    eid = container.create_exec(command)
+                    for chunk in container.start_exec(eid, stream=True):
+                        outputs[name].append(chunk)
+                except Exception as e:
+                    outputs[name].append("%s" % e)
+            results.put(name)
+
+        print "Running %s on %s containers :" % (command, len(containers))
+        for container in containers:
+            thread = threading.Thread(target=run, args=(container,))
+            thread.daemon = True
+            thread.start()
+
+        deadline = time.time() + timeout if timeout else None
+        pending = set(outputs)
+        while pending:
+            try:
+                # A get() without a timeout can not be interrupted on python 2.
+                wait = max(0, deadline - time.time()) if deadline else 24 * 3600
+                name = results.get(timeout=wait)
+            except Queue.Empty:
+                break
+            pending.discard(name)
+            output = "".join(outputs[name])
+            print "\n%s: %s " % (name, output)
+            yield name, output, False
+
+        for name in sorted(pending):
+            output = "".join(outputs[name])
+            print "\n%s timed out after %ss: %s " % (name, timeout, output)
+            yield name, output, True
+
+
+def fixture_key(working_dir, config_file):
+    """
+    Identifies a fixture by its content, so that classes (and modules) using the same fixture share a cluster, and by
+    the IMAGE_OVERRIDES applied to it, so that a cluster running other images is never reused.
+    """
+    digest = hashlib.sha1()
+    with open(os.path.join(working_dir, config_file)) as f:
+        digest.update(f.read())
+    digest.update(json.dumps(sorted(IMAGE_OVERRIDES.items())))
+    return digest.hexdigest()
+
+
+def host_resources(cluster):
+    """
+    Returns what a cluster holds on the docker host: its project name, its published host ports and, when a service
+    uses host networking, "host" (the ports used there are not declared in the fixture).
+    """
+    resources = set([("project", cluster.name)])
+    for service in cluster.cd.services:
+        if service.get("network_mode") == "host":
+            resources.add(("network", "host"))
+        for port in service.get("ports", []):
+            parts = str(port).split(":")
+            if len(parts) > 1:
+                resources.add(("port", parts[-2]))
+    return resources
+
+
+class ClusterPool():
+    """
+    Keeps clusters running across test classes, keyed by the content of their fixture file.
+
+    A released cluster stays up so the next class that asks for the same fixture reuses it, after running the
+    optional reset hook (for example delete_topics or delete_zookeeper_path). The optional setup hook runs once,
+    after the cluster starts. A fixture can be acquired by one class at a time. A reused cluster keeps the project
+    name it was started with. An idle cluster is shut down only when a cluster that needs its project name or host
+    ports starts, when more than max_idle clusters are idle, and at the end of the session. Set CLUSTER_POOL=false
+    to start a fresh cluster for every class.
+    """
+
+    def __init__(self, enabled=True, max_idle=2):
+        self.enabled = enabled
+        self.max_idle = max_idle
+        self.clusters = {}
+        self.in_use = set()
+        # Keys of the idle clusters, least recently released first.
+        self.idle = []
+
+    def acquire(self, name, working_dir, config_file, reset=None, setup=None):
+        key = fixture_key(working_dir, config_file)
+        if key in self.in_use:
+            # A second cluster from the same fixture would use the same project name and host ports, and would
+            # recreate the containers of the cluster in use.
+            raise RuntimeError("The cluster for %s is already in use by another test class" % config_file)
+        cluster = self.clusters.get(key)
+        if cluster is not None and cluster.is_running():
+            print "Reusing cluster %s (%s)" % (cluster.name, cluster.config_file)
+            self.idle.remove(key)
+            if reset is not None:
+                reset(cluster)
+        else:
+            if key in self.idle:
+                # The pooled cluster is not running any more.
+                self._shutdown(key)
+            cluster = TestCluster(name, working_dir, config_file)
+            cluster.start()
+            if setup is not None:
+                setup(cluster)
+            self.clusters[key] = cluster
+        self.in_use.add(key)
+        return cluster
+
+    def release(self, cluster):
+        for key, pooled in self.clusters.items():
+            if pooled is cluster:
+                self.in_use.discard(key)
+                if not self.enabled:
+                    self._shutdown(key)
+                    return
+                self.idle.append(key)
+                while len(self.idle) > self.max_idle:
+                    self._shutdown(self.idle[0])
+                return
+        cluster.shutdown()
+
+    def make_room(self, cluster):
+        """Shuts down the idle clusters that use the project name or the host ports that cluster needs."""
+        needed = host_resources(cluster)
+        for key in list(self.idle):
+            if host_resources(self.clusters[key]) & needed:
+                self._shutdown(key)
+
+    def shutdown_idle(self):
+        for key in list(self.idle):
+            self._shutdown(key)
+
+    def shutdown_all(self):
+        self.in_use.clear()
+        self.idle = list(self.clusters)
+        self.shutdown_idle()
+
+    def _shutdown(self, key):
+        cluster = self.clusters.pop(key)
+        if key in self.idle:
+            self.idle.remove(key)
+        cluster.shutdown()
+
+
+CLUSTER_POOL = ClusterPool(enabled=os.environ.get("CLUSTER_POOL", "true") != "false",
+                           max_idle=int(os.environ.get("CLUSTER_POOL_MAX_IDLE", "2")))
+atexit.register(CLUSTER_POOL.shutdown_all)
+
+
+def acquire_cluster(name, working_dir, config_file, reset=None, setup=None):
+    return CLUSTER_POOL.acquire(name, working_dir, config_file, reset, setup)
+
+
+def release_cluster(cluster):
+    CLUSTER_POOL.release(cluster)
+
+
+def delete_topics(cluster, service, zookeeper_connect):
+    """Reset hook helper, deletes all topics except the internal ones."""
+    cmd = "bash -c 'kafka-topics --zookeeper {zk} --list | grep -v \"^__\" | xargs -r -n 1 kafka-topics --zookeeper {zk} --delete --topic'"
+    return cluster.run_command_on_service(service, cmd.format(zk=zookeeper_connect))
+
+
+def delete_zookeeper_path(cluster, service, zookeeper_connect, path):
+    """Reset hook helper, recursively deletes a path (such as a chroot) in Zookeeper."""
+    return cluster.run_command_on_service(service, "zookeeper-shell %s rmr %s" % (zookeeper_connect, path))
+
 
 class TestMachine():
 